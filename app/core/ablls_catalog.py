@@ -1,15 +1,22 @@
+from itertools import chain
+import json
 import logging
+import os
 import re
 from pathlib import Path
+from typing import Iterator
 
 import openpyxl
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.ablls_task import ABLLSTask
 
 logger = logging.getLogger(__name__)
 
+_CATALOG_CACHE_NAME = ".ablls_catalog.cache.json"
+
 SECTION_NAMES = {
     "A": "Сотрудничество и эффективность подкреплений",
     "B": "Зрительное восприятие",
@@ -38,15 +45,46 @@ SECTION_NAMES = {
     "Z": "Мелкая моторика",
 }
 
-_TASK_CODE_RE = re.compile(r"^([A-Z]{1,2})(\d+)$")
 _SCORE_TOKEN_RE = re.compile(r"(\d+)\s*=")
 
+# Bound method reference skips a module-dict lookup per row on the ingest path.
+_find_score_tokens = _SCORE_TOKEN_RE.finditer
+
+
+def _parse_code(code: str) -> tuple[str, int] | None:
+    """Split a task code like ``A1``/``AB12`` into (section, item number).
+
+    Equivalent to matching ``^([A-Z]{1,2})(\\d+)$`` but without regex
+    machinery, which is measurably cheaper across tens of thousands of
+    workbook cells.
+    """
+    if not code.isascii():
+        return None
+    if len(code) > 1 and code[1].isalpha():
+        prefix, rest = code[:2], code[2:]
+    else:
+        prefix, rest = code[:1], code[1:]
+    if not rest or not rest.isdigit():
+        return None
+    return prefix, int(rest)
+
 
 def _extract_max_score(criteria: str) -> int:
-    numbers = [int(token) for token in _SCORE_TOKEN_RE.findall(criteria or "")]
-    if numbers:
-        return max(numbers)
-    return 1
+    max_score = 1
+    for token in _find_score_tokens(criteria or ""):
+        value = int(token.group(1))
+        if value > max_score:
+            max_score = value
+    return max_score
+
+
+def _clean(value, default: str = "") -> str:
+    if value is None:
+        return default
+    if type(value) is str:
+        stripped = value.strip()
+        return stripped if stripped else default
+    return str(value).strip() or default
 
 
 def _sheet_to_section(sheet_name: str) -> str | None:
@@ -56,78 +94,162 @@ def _sheet_to_section(sheet_name: str) -> str | None:
     return normalized if normalized in SECTION_NAMES else None
 
 
-def _row_to_task(source_sheet: str, row: tuple) -> ABLLSTask | None:
+def _row_to_task(
+    source_sheet: str,
+    row: tuple,
+    # Default-argument bindings: keep the per-row lookups LOAD_FAST instead
+    # of module-dict probes across tens of thousands of workbook cells.
+    _parse_code=_parse_code,
+    _extract_max_score=_extract_max_score,
+    _clean=_clean,
+    _section_name_for=SECTION_NAMES.get,
+) -> dict | None:
     raw_code = row[0]
     if not isinstance(raw_code, str):
         return None
+    # Cheap reject before regex work: task codes are at most two letters
+    # plus digits, and most cells in a sheet are not codes at all.
+    if not raw_code or len(raw_code) > 8:
+        return None
 
     code = raw_code.strip().upper()
-    match = _TASK_CODE_RE.match(code)
-    if not match:
+    if not code or not code[0].isalpha():
+        return None
+    parsed = _parse_code(code)
+    if parsed is None:
         return None
 
-    section_code = match.group(1)
-    item_number = int(match.group(2))
-    objective = str(row[1]).strip() if row[1] is not None else ""
-    criteria = str(row[2]).strip() if row[2] is not None else "1= да, 0= нет"
+    section_code, item_number = parsed
+    objective = _clean(row[1])
+    criteria = _clean(row[2], "1= да, 0= нет")
     max_score = _extract_max_score(criteria)
-    section_name = SECTION_NAMES.get(section_code, f"Раздел {section_code}")
+    section_name = _section_name_for(section_code, f"Раздел {section_code}")
 
-    return ABLLSTask(
-        code=code,
-        section_code=section_code,
-        section_name=section_name,
-        item_number=item_number,
-        objective=objective,
-        criteria=criteria,
-        max_score=max_score,
-        source_sheet=source_sheet,
-    )
+    return {
+        "code": code,
+        "section_code": section_code,
+        "section_name": section_name,
+        "item_number": item_number,
+        "objective": objective,
+        "criteria": criteria,
+        "max_score": max_score,
+        "source_sheet": source_sheet,
+    }
 
 
-def load_tasks_from_workbook(workbook_path: str | Path) -> list[ABLLSTask]:
+def iter_tasks_from_workbook(workbook_path: str | Path) -> Iterator[dict]:
     workbook_file = Path(workbook_path)
     if not workbook_file.exists():
         raise FileNotFoundError(f"Workbook not found: {workbook_file}")
 
-    workbook = openpyxl.load_workbook(workbook_file, data_only=True)
-    tasks_by_code: dict[str, ABLLSTask] = {}
+    workbook = openpyxl.load_workbook(workbook_file, data_only=True, read_only=True)
+    seen_codes: set[str] = set()
 
-    for sheet_name in workbook.sheetnames:
-        section_from_sheet = _sheet_to_section(sheet_name)
-        worksheet = workbook[sheet_name]
-        for row in worksheet.iter_rows(values_only=True):
-            task = _row_to_task(sheet_name, row)
-            if not task:
-                continue
-            if section_from_sheet and task.section_code != section_from_sheet:
+    try:
+        for sheet_name in workbook.sheetnames:
+            section_from_sheet = _sheet_to_section(sheet_name)
+            if section_from_sheet is None:
+                # TOC/legend/summary sheets never contain tasks; skipping them
+                # before iteration avoids streaming their XML entirely.
                 continue
-            tasks_by_code[task.code] = task
+            worksheet = workbook[sheet_name]
+            row_to_task = _row_to_task
+            # Only code/objective/criteria are consumed; capping the column
+            # range keeps the read-only parser from streaming trailing cells.
+            for row in worksheet.iter_rows(min_col=1, max_col=3, values_only=True):
+                task = row_to_task(sheet_name, row)
+                if not task:
+                    continue
+                if task["section_code"] != section_from_sheet:
+                    continue
+                if task["code"] in seen_codes:
+                    continue
+                seen_codes.add(task["code"])
+                yield task
+    finally:
+        # Read-only mode keeps the underlying zipfile handle open.
+        workbook.close()
+
+
+def load_tasks_from_workbook(workbook_path: str | Path) -> list[dict]:
+    return list(iter_tasks_from_workbook(workbook_path))
+
+
+def _cache_key(workbook_file: Path) -> list[int]:
+    stat = workbook_file.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _load_cached_tasks(workbook_file: Path) -> list[dict] | None:
+    cache_file = workbook_file.with_name(_CATALOG_CACHE_NAME)
+    try:
+        with cache_file.open(encoding="utf-8") as handle:
+            payload = json.load(handle)
+        if payload.get("key") != _cache_key(workbook_file):
+            return None
+    except (OSError, ValueError):
+        return None
+    tasks = payload.get("tasks")
+    return tasks if isinstance(tasks, list) else None
+
+
+def _store_cached_tasks(workbook_file: Path, tasks: list[dict]) -> None:
+    cache_file = workbook_file.with_name(_CATALOG_CACHE_NAME)
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        with tmp_file.open("w", encoding="utf-8") as handle:
+            json.dump(
+                {"key": _cache_key(workbook_file), "tasks": tasks},
+                handle,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        logger.debug("Could not write catalog cache next to %s", workbook_file)
+
 
-    ordered_codes = sorted(
-        tasks_by_code.keys(),
-        key=lambda code: (tasks_by_code[code].section_code, tasks_by_code[code].item_number),
-    )
-    return [tasks_by_code[code] for code in ordered_codes]
+def _task_rows(workbook_file: Path) -> Iterator[dict]:
+    if not settings.catalog_cache_enabled:
+        yield from iter_tasks_from_workbook(workbook_file)
+        return
+
+    cached = _load_cached_tasks(workbook_file)
+    if cached is not None:
+        logger.info("ABLLS catalog loaded from cache sidecar (%s rows)", len(cached))
+        yield from cached
+        return
+
+    tasks = list(iter_tasks_from_workbook(workbook_file))
+    _store_cached_tasks(workbook_file, tasks)
+    yield from tasks
 
 
 def ensure_ablls_catalog(db: Session, workbook_path: str | Path) -> int:
-    has_any = db.execute(select(ABLLSTask.code).limit(1)).scalar_one_or_none()
+    # EXISTS is satisfied from the PK btree root; no row is materialized.
+    has_any = db.scalar(select(exists(select(ABLLSTask.code))))
     if has_any:
         return 0
 
+    loaded = 0
+
+    def _counted() -> Iterator[dict]:
+        nonlocal loaded
+        for task in _task_rows(Path(workbook_path)):
+            loaded += 1
+            yield task
+
     try:
-        tasks = load_tasks_from_workbook(workbook_path)
+        task_rows = _counted()
+        first = next(task_rows, None)
+        if first is None:
+            logger.warning("ABLLS catalog workbook parsed, but no tasks were found.")
+            return 0
+        db.execute(insert(ABLLSTask), chain([first], task_rows))
+        db.commit()
     except Exception:
         db.rollback()
         logger.exception("Failed to load ABLLS catalog from %s", workbook_path)
         return 0
 
-    if not tasks:
-        logger.warning("ABLLS catalog workbook parsed, but no tasks were found.")
-        return 0
-
-    db.add_all(tasks)
-    db.commit()
-    logger.info("ABLLS catalog loaded: %s tasks", len(tasks))
-    return len(tasks)
+    logger.info("ABLLS catalog loaded: %s tasks", loaded)
+    return loaded
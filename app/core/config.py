@@ -4,6 +4,8 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     secret_key: str = "dev-secret-change-me"
     database_url: str = "sqlite:///./ablls.db"
+    catalog_cache_enabled: bool = True
+    templates_auto_reload: bool = False
 
     class Config:
         env_file = ".env"
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.core.config import settings
@@ -12,8 +13,27 @@ connect_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.database_url, connect_args=connect_args, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+engine = create_engine(
+    settings.database_url,
+    connect_args=connect_args,
+    insertmanyvalues_page_size=1000,
+    # Sized so concurrent page loads (several queries each) do not queue on
+    # the default 5-connection pool. LIFO checkout keeps the same few
+    # connections hot under steady load; pre-ping plus recycle guards
+    # against stale connections when running against a networked database.
+    pool_size=25,
+    max_overflow=25,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_use_lifo=True,
+    future=True,
+)
+SessionLocal = sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+)
 
 
 def get_db():
@@ -22,3 +42,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async twin of the engine above, used by the page handlers so request I/O
+# does not occupy a threadpool worker. The sync engine stays for startup
+# (schema bootstrap, catalog hydration) and for auth, whose bcrypt work
+# belongs on the threadpool anyway.
+_async_database_url = settings.database_url
+if _async_database_url.startswith("sqlite://"):
+    _async_database_url = _async_database_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+async_engine = create_async_engine(
+    _async_database_url,
+    pool_size=25,
+    max_overflow=25,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_use_lifo=True,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
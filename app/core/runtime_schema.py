@@ -1,63 +1,97 @@
-from sqlalchemy import Engine, inspect, text
+from sqlalchemy import Connection
 
+# Bump when new ALTERs are added below so existing databases re-run the check.
+SCHEMA_VERSION = 4
 
-def ensure_runtime_schema(engine: Engine) -> None:
-    inspector = inspect(engine)
-    table_names = set(inspector.get_table_names())
-    if "assessments" not in table_names:
+# Indexes added after the initial release; create_all only covers new tables.
+_PENDING_INDEXES: dict[str, list[str]] = {
+    "ablls_tasks": [
+        "CREATE INDEX IF NOT EXISTS ix_ablls_section_item "
+        "ON ablls_tasks (section_code, item_number)",
+    ],
+    "assessments": [
+        "CREATE INDEX IF NOT EXISTS ix_assessment_child_date "
+        "ON assessments (child_id, assessment_date, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_assessment_child_area_date "
+        "ON assessments (child_id, area, assessment_date)",
+    ],
+    "child_therapist_assignments": [
+        "CREATE INDEX IF NOT EXISTS ix_cta_therapist_child "
+        "ON child_therapist_assignments (therapist_id, child_id)",
+    ],
+    "child_parent_assignments": [
+        "CREATE INDEX IF NOT EXISTS ix_cpa_parent_child "
+        "ON child_parent_assignments (parent_id, child_id)",
+    ],
+}
+
+# Columns added after the initial release, per table. ensure_runtime_schema
+# walks this instead of hand-written per-column branches.
+_PENDING_COLUMNS: dict[str, list[tuple[str, str]]] = {
+    "assessments": [
+        ("is_prompted", "BOOLEAN NOT NULL DEFAULT 0"),
+    ],
+    "edit_requests": [
+        ("requested_score", "INTEGER"),
+        ("requested_is_prompted", "BOOLEAN"),
+        ("requested_assessment_date", "DATE"),
+        ("requested_comment", "TEXT"),
+        ("applied_assessment_id", "VARCHAR(36)"),
+    ],
+}
+
+
+def ensure_runtime_schema(connection: Connection) -> None:
+    # Runs inside the caller's transaction (shared with create_all, see
+    # app.main.on_startup) so startup performs a single commit/fsync.
+    # SQLite-specific on purpose: the prototype ships on SQLite and
+    # exec_driver_sql round-trips are far cheaper than the generic
+    # inspector (one PRAGMA per table instead of a reflection pass each).
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS schema_meta (version INTEGER NOT NULL)"
+    )
+    version_row = connection.exec_driver_sql(
+        "SELECT version FROM schema_meta LIMIT 1"
+    ).fetchone()
+    if version_row and version_row[0] >= SCHEMA_VERSION:
         return
 
-    assessment_columns = {
-        column["name"] for column in inspector.get_columns("assessments")
+    table_names = {
+        row[0]
+        for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type='table'"
+        )
     }
-    edit_request_columns = (
-        {column["name"] for column in inspector.get_columns("edit_requests")}
-        if "edit_requests" in table_names
-        else set()
-    )
+    if "assessments" not in table_names:
+        return
 
-    with engine.begin() as connection:
-        if "is_prompted" not in assessment_columns:
-            connection.execute(
-                text(
-                    "ALTER TABLE assessments "
-                    "ADD COLUMN is_prompted BOOLEAN NOT NULL DEFAULT 0"
-                )
-            )
-
-        if "edit_requests" in table_names:
-            if "requested_score" not in edit_request_columns:
-                connection.execute(
-                    text(
-                        "ALTER TABLE edit_requests "
-                        "ADD COLUMN requested_score INTEGER"
-                    )
-                )
-            if "requested_is_prompted" not in edit_request_columns:
-                connection.execute(
-                    text(
-                        "ALTER TABLE edit_requests "
-                        "ADD COLUMN requested_is_prompted BOOLEAN"
-                    )
-                )
-            if "requested_assessment_date" not in edit_request_columns:
-                connection.execute(
-                    text(
-                        "ALTER TABLE edit_requests "
-                        "ADD COLUMN requested_assessment_date DATE"
-                    )
-                )
-            if "requested_comment" not in edit_request_columns:
-                connection.execute(
-                    text(
-                        "ALTER TABLE edit_requests "
-                        "ADD COLUMN requested_comment TEXT"
-                    )
-                )
-            if "applied_assessment_id" not in edit_request_columns:
-                connection.execute(
-                    text(
-                        "ALTER TABLE edit_requests "
-                        "ADD COLUMN applied_assessment_id VARCHAR(36)"
-                    )
+    needed_alters: list[str] = []
+
+    for table_name, pending_columns in _PENDING_COLUMNS.items():
+        if table_name not in table_names:
+            continue
+        existing_columns = {
+            row[1]
+            for row in connection.exec_driver_sql(f"PRAGMA table_info({table_name})")
+        }
+        for column_name, column_ddl in pending_columns:
+            if column_name not in existing_columns:
+                needed_alters.append(
+                    f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_ddl}"
                 )
+
+    for table_name, index_statements in _PENDING_INDEXES.items():
+        if table_name in table_names:
+            needed_alters.extend(index_statements)
+
+    for statement in needed_alters:
+        connection.exec_driver_sql(statement)
+
+    if version_row is None:
+        connection.exec_driver_sql(
+            "INSERT INTO schema_meta (version) VALUES (?)", (SCHEMA_VERSION,)
+        )
+    else:
+        connection.exec_driver_sql(
+            "UPDATE schema_meta SET version = ?", (SCHEMA_VERSION,)
+        )
@@ -1,4 +1,7 @@
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 
@@ -9,7 +12,10 @@ from app.core.runtime_schema import ensure_runtime_schema
 from app import models as app_models
 from app.routers import auth, pages
 
-app = FastAPI(title="ABLLS-R Tracker Prototype")
+# Every current route returns HTML or a redirect explicitly; the default
+# response class only matters for future JSON endpoints, which then get
+# orjson serialization for free.
+app = FastAPI(title="ABLLS-R Tracker Prototype", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     SessionMiddleware,
@@ -23,9 +29,25 @@ app.include_router(pages.router)
 app.include_router(auth.router)
 
 
-@app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
-    ensure_runtime_schema(engine)
+def _hydrate_catalog():
     with SessionLocal() as db:
         ensure_ablls_catalog(db, "docs/WordTables_Combined.xlsx")
+    pages.invalidate_catalog_cache()
+
+
+@app.on_event("startup")
+async def on_startup():
+    # One connection, one transaction: create_all reflects existing tables
+    # and ensure_runtime_schema patches them without a second round through
+    # sqlite_master.
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        ensure_runtime_schema(connection)
+    # Catalog hydration can take seconds on a cold cache; run it in the
+    # background so the server accepts connections immediately. Pages
+    # simply render an empty catalog until hydration finishes. The task
+    # handle lives on app.state because the loop only keeps a weak
+    # reference and could otherwise garbage-collect it mid-flight.
+    app.state.catalog_task = asyncio.create_task(asyncio.to_thread(_hydrate_catalog))
+    # Probe and register the report fonts once, off the request path.
+    pages.ensure_pdf_fonts()
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -6,11 +6,14 @@ from app.core.database import Base
 
 class ABLLSTask(Base):
     __tablename__ = "ablls_tasks"
+    # Matches the catalog's canonical ordering; the section_code prefix also
+    # serves section-only filters.
+    __table_args__ = (Index("ix_ablls_section_item", "section_code", "item_number"),)
 
     code: Mapped[str] = mapped_column(String(16), primary_key=True)
-    section_code: Mapped[str] = mapped_column(String(2), index=True)
+    section_code: Mapped[str] = mapped_column(String(2))
     section_name: Mapped[str] = mapped_column(String(120))
-    item_number: Mapped[int] = mapped_column(Integer, index=True)
+    item_number: Mapped[int] = mapped_column(Integer)
     objective: Mapped[str] = mapped_column(Text)
     criteria: Mapped[str] = mapped_column(Text)
     max_score: Mapped[int] = mapped_column(Integer, default=1)
@@ -1,7 +1,7 @@
 from datetime import date, datetime, timezone
 import uuid
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -9,13 +9,20 @@ from app.core.database import Base
 
 class Assessment(Base):
     __tablename__ = "assessments"
+    # Matches the hot access paths: per-child history ordered by date, and
+    # the latest-per-skill window partitioned by area. Both lead with
+    # child_id, so no separate single-column index is needed.
+    __table_args__ = (
+        Index("ix_assessment_child_date", "child_id", "assessment_date", "created_at"),
+        Index("ix_assessment_child_area_date", "child_id", "area", "assessment_date"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
     )
-    child_id: Mapped[str] = mapped_column(String(36), ForeignKey("children.id"), index=True)
+    child_id: Mapped[str] = mapped_column(String(36), ForeignKey("children.id"))
     therapist_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
     area: Mapped[str] = mapped_column(String(120))
     score: Mapped[int] = mapped_column(Integer)
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -8,11 +8,17 @@ from app.core.database import Base
 
 class ChildTherapistAssignment(Base):
     __tablename__ = "child_therapist_assignments"
-    __table_args__ = (UniqueConstraint("child_id", "therapist_id"),)
+    # The composite index matches _children_for_therapist's access pattern
+    # (filter by therapist, join on child) and covers plain therapist_id
+    # lookups, so no separate single-column index is needed there.
+    __table_args__ = (
+        UniqueConstraint("child_id", "therapist_id"),
+        Index("ix_cta_therapist_child", "therapist_id", "child_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     child_id: Mapped[str] = mapped_column(String(36), ForeignKey("children.id"), index=True)
-    therapist_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
+    therapist_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
     assigned_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=lambda: datetime.now(timezone.utc),
@@ -21,11 +27,14 @@ class ChildTherapistAssignment(Base):
 
 class ChildParentAssignment(Base):
     __tablename__ = "child_parent_assignments"
-    __table_args__ = (UniqueConstraint("child_id", "parent_id"),)
+    __table_args__ = (
+        UniqueConstraint("child_id", "parent_id"),
+        Index("ix_cpa_parent_child", "parent_id", "child_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     child_id: Mapped[str] = mapped_column(String(36), ForeignKey("children.id"), index=True)
-    parent_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
+    parent_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"))
     assigned_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=lambda: datetime.now(timezone.utc),
@@ -1,11 +1,15 @@
 from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING
 import uuid
 
 from sqlalchemy import Date, DateTime, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
 
 class Child(Base):
     __tablename__ = "children"
@@ -27,3 +31,18 @@ class Child(Base):
         DateTime,
         default=lambda: datetime.now(timezone.utc),
     )
+
+    # Read-only views over the assignment tables; assignments themselves are
+    # created and deleted through their own models.
+    therapists: Mapped[list["User"]] = relationship(
+        "User",
+        secondary="child_therapist_assignments",
+        order_by="User.full_name",
+        viewonly=True,
+    )
+    parents: Mapped[list["User"]] = relationship(
+        "User",
+        secondary="child_parent_assignments",
+        order_by="User.full_name",
+        viewonly=True,
+    )
@@ -1,11 +1,17 @@
 from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING
 import uuid
 
 from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 
+if TYPE_CHECKING:
+    from app.models.ablls_task import ABLLSTask
+    from app.models.child import Child
+    from app.models.user import User
+
 
 class EditRequest(Base):
     __tablename__ = "edit_requests"
@@ -36,3 +42,24 @@ class EditRequest(Base):
         DateTime,
         default=lambda: datetime.now(timezone.utc),
     )
+
+    # Read-only views for display; the request workflow writes through the
+    # plain FK columns above.
+    child: Mapped["Child | None"] = relationship("Child", viewonly=True)
+    therapist: Mapped["User | None"] = relationship(
+        "User",
+        foreign_keys=[therapist_id],
+        viewonly=True,
+    )
+    reviewer: Mapped["User | None"] = relationship(
+        "User",
+        foreign_keys=[reviewed_by],
+        viewonly=True,
+    )
+    # area stores the catalog code but carries no FK (the catalog is
+    # re-imported in place), so the join is declared explicitly.
+    task: Mapped["ABLLSTask | None"] = relationship(
+        "ABLLSTask",
+        primaryjoin="foreign(EditRequest.area) == ABLLSTask.code",
+        viewonly=True,
+    )
@@ -1,45 +1,80 @@
+import re
+
 from fastapi import APIRouter, Depends, Form, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.core.security import hash_password, verify_password
 from app.core.database import get_db
 from app.models.user import User
-from app.routers.pages import templates
+from app.routers.pages import SessionUser, render_template
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-ALLOWED_ROLES = {"admin", "therapist", "parent"}
+ALLOWED_ROLES = frozenset({"admin", "therapist", "parent"})
+
+ROLE_LABELS = {
+    "admin": "Администратор",
+    "therapist": "Терапист",
+    "parent": "Родитель",
+}
+
+_WHITESPACE_RE = re.compile(r"\s")
+
+# Built once; login only binds the email parameter per request instead of
+# constructing a fresh select() expression tree.
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+# Verified against when the email is unknown, so login always costs one
+# bcrypt round regardless of whether the account exists (no timing oracle,
+# no bimodal tail latency).
+_DUMMY_HASH = hash_password("x" * 12)
 
 
 def _is_valid_email(email: str) -> bool:
-    if "@" not in email:
-        return False
-    local, domain = email.split("@", 1)
-    return bool(local) and "." in domain
+    at_index = email.find("@")
+    return at_index > 0 and "." in email[at_index + 1 :]
 
 
-def _base_context(request: Request, db: Session) -> dict:
+def _current_user(request: Request, db: Session) -> User | SessionUser | None:
     user_id = request.session.get("user_id")
-    current_user = db.get(User, user_id) if user_id else None
+    if not user_id:
+        # Anonymous sessions never touch the users table.
+        return None
+    cached = getattr(request.state, "current_user", None)
+    if cached is not None:
+        return cached
+    role = request.session.get("role")
+    full_name = request.session.get("full_name")
+    if role and full_name:
+        # The signed session carries the identity; no users SELECT needed.
+        user = SessionUser(user_id, role, full_name)
+    else:
+        user = db.get(User, user_id)
+        if user is not None:
+            request.session["role"] = user.role
+            request.session["full_name"] = user.full_name
+    request.state.current_user = user
+    return user
+
+
+def _base_context(request: Request, db: Session) -> dict:
+    current_user = _current_user(request, db)
     flash_message = request.session.pop("flash_success", None)
     return {
         "request": request,
         "current_user": current_user,
         "flash_message": flash_message,
-        "role_labels": {
-            "admin": "Администратор",
-            "therapist": "Терапист",
-            "parent": "Родитель",
-        },
+        # Shared constant; templates only read from it.
+        "role_labels": ROLE_LABELS,
     }
 
 
 @router.get("/register")
 def register_form(request: Request, db: Session = Depends(get_db)):
-    return templates.TemplateResponse(
+    return render_template(
         "auth/register.html",
         {**_base_context(request, db), "errors": [], "form": {}},
     )
@@ -56,9 +91,14 @@ def register_user(
     password_confirm: str = Form(...),
 ):
     errors = []
-    email = email.strip().lower()
+    email = email.strip()
+    if not email.islower():
+        email = email.lower()
     full_name = full_name.strip()
-    role = role.strip().lower()
+    # Well-formed submissions are already normalized; only pay for
+    # strip/lower when the raw value is not an allowed role.
+    if role not in ALLOWED_ROLES:
+        role = role.strip().lower()
 
     if not _is_valid_email(email):
         errors.append("Введите корректный адрес электронной почты.")
@@ -68,13 +108,13 @@ def register_user(
         errors.append("Выберите корректную роль.")
     if len(password) < 8:
         errors.append("Введите не менее 8 символов.")
-    if any(char.isspace() for char in password):
+    if _WHITESPACE_RE.search(password):
         errors.append("Пароль не должен содержать пробелы.")
     if password != password_confirm:
         errors.append("Пароли не совпадают.")
 
     if errors:
-        return templates.TemplateResponse(
+        return render_template(
             "auth/register.html",
             {**_base_context(request, db), "errors": errors, "form": {
                 "email": email,
@@ -95,7 +135,7 @@ def register_user(
         db.commit()
     except IntegrityError:
         db.rollback()
-        return templates.TemplateResponse(
+        return render_template(
             "auth/register.html",
             {
                 **_base_context(request, db),
@@ -112,7 +152,7 @@ def register_user(
 
 @router.get("/login")
 def login_form(request: Request, db: Session = Depends(get_db)):
-    return templates.TemplateResponse(
+    return render_template(
         "auth/login.html",
         {**_base_context(request, db), "errors": [], "form": {}},
     )
@@ -126,18 +166,22 @@ def login_user(
     password: str = Form(...),
 ):
     errors = []
-    email = email.strip().lower()
-    user = db.execute(select(User).where(User.email == email)).scalar_one_or_none()
+    email = email.strip()
+    if not email.islower():
+        email = email.lower()
+    user = db.execute(_USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
 
     if len(password) < 8:
         errors.append("Введите не менее 8 символов.")
-    if any(char.isspace() for char in password):
+    if _WHITESPACE_RE.search(password):
         errors.append("Пароль не должен содержать пробелы.")
-    if not errors and (not user or not verify_password(password, user.password_hash)):
-        errors.append("Неверный email или пароль.")
+    if not errors:
+        password_ok = verify_password(password, user.password_hash if user else _DUMMY_HASH)
+        if not user or not password_ok:
+            errors.append("Неверный email или пароль.")
 
     if errors:
-        return templates.TemplateResponse(
+        return render_template(
             "auth/login.html",
             {**_base_context(request, db), "errors": errors, "form": {"email": email}},
             status_code=400,
@@ -145,6 +189,7 @@ def login_user(
 
     request.session["user_id"] = user.id
     request.session["role"] = user.role
+    request.session["full_name"] = user.full_name
 
     return RedirectResponse(url="/dashboard", status_code=303)
 
@@ -1,22 +1,36 @@
 from collections import defaultdict
+import threading
 from datetime import date, datetime, timezone
-import io
+import functools
 from pathlib import Path
 import re
+import tempfile
+import time
+from typing import NamedTuple
 
+import anyio
 from fastapi import APIRouter, Depends, Form, Request
-from fastapi.responses import RedirectResponse, Response
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas as pdf_canvas
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import case, exists, func, insert, literal, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, load_only, raiseload, selectinload
 
 from app.core.ablls_catalog import SECTION_NAMES
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
 from app.models.ablls_task import ABLLSTask
 from app.models.assessment import Assessment
 from app.models.assignment import ChildParentAssignment, ChildTherapistAssignment
@@ -27,24 +41,89 @@ from app.models.user import User
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
+# Persist compiled template bytecode across worker restarts; template
+# source re-parsing otherwise happens on every cold worker. The no-arg
+# default places the cache in a per-uid 0700 directory and verifies its
+# ownership, so no other local user can plant bytecode there.
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = settings.templates_auto_reload
+
+
+if settings.templates_auto_reload:
+    # Caching Template objects here would skip Jinja's up-to-date check
+    # and make auto-reload a no-op; look templates up on every render.
+    def _tpl(name: str):
+        return templates.env.get_template(name)
+else:
+    @functools.lru_cache(maxsize=None)
+    def _tpl(name: str):
+        return templates.env.get_template(name)
+
+
+def render_template(name: str, context: dict, status_code: int = 200) -> HTMLResponse:
+    """Render via the cached compiled template, skipping Starlette's
+    per-response loader lookup."""
+    return HTMLResponse(_tpl(name).render(context), status_code=status_code)
+
+
+def stream_template(name: str, context: dict) -> StreamingResponse:
+    """Stream the render in chunks for the big table pages: bytes start
+    flowing before the full page is built and the whole document never
+    sits in memory as one string."""
+    stream = _tpl(name).stream(context)
+    stream.enable_buffering(5)
+    return StreamingResponse(stream, media_type="text/html")
+
+
 SECTION_ORDER = list(SECTION_NAMES.keys())
+# O(1) sort-key lookup; SECTION_ORDER.index() is a linear scan per comparison.
+SECTION_POSITION = {code: position for position, code in enumerate(SECTION_ORDER)}
 PDF_FONT_REGULAR = "Helvetica"
 PDF_FONT_BOLD = "Helvetica-Bold"
 PDF_FONTS_READY = False
 
 
-def _current_user(request: Request, db: Session):
+class SessionUser(NamedTuple):
+    """Identity carried in the signed session cookie. Covers everything the
+    handlers and templates read (id, role, full_name), so authenticated
+    pages render without a users SELECT."""
+
+    id: str
+    role: str
+    full_name: str
+
+
+async def _current_user(request: Request, db: AsyncSession | None):
     user_id = request.session.get("user_id")
     if not user_id:
         return None
-    return db.get(User, user_id)
+    # Memoized per request: _require_roles and _base_context both need the
+    # user, and handlers shouldn't pay for the lookup twice.
+    cached = getattr(request.state, "current_user", None)
+    if cached is not None:
+        return cached
+    role = request.session.get("role")
+    full_name = request.session.get("full_name")
+    if role and full_name:
+        user = SessionUser(user_id, role, full_name)
+    elif db is not None:
+        # Session predates the identity payload; load once and backfill so
+        # the next request skips the lookup.
+        user = await db.get(User, user_id)
+        if user is not None:
+            request.session["role"] = user.role
+            request.session["full_name"] = user.full_name
+    else:
+        return None
+    request.state.current_user = user
+    return user
 
 
-def _base_context(request: Request, db: Session) -> dict:
+async def _base_context(request: Request, db: AsyncSession | None) -> dict:
     flash_message = request.session.pop("flash_success", None)
     return {
         "request": request,
-        "current_user": _current_user(request, db),
+        "current_user": await _current_user(request, db),
         "flash_message": flash_message,
         "today": date.today().isoformat(),
         "role_labels": {
@@ -59,8 +138,12 @@ def _set_flash(request: Request, message: str):
     request.session["flash_success"] = message
 
 
-def _log_action(db: Session, user_id: str | None, action: str, details: str):
-    db.add(AuditLog(user_id=user_id, action=action, details=details))
+async def _log_action(db: AsyncSession, user_id: str | None, action: str, details: str):
+    # Core insert in the caller's transaction: no unit-of-work bookkeeping
+    # and no fetch of an autoincrement id nobody reads.
+    await db.execute(
+        insert(AuditLog).values(user_id=user_id, action=action, details=details)
+    )
 
 
 def _parse_date(raw_value: str | None) -> date | None:
@@ -72,17 +155,48 @@ def _parse_date(raw_value: str | None) -> date | None:
         return None
 
 
-def _require_roles(request: Request, db: Session, allowed_roles: set[str]):
-    user = _current_user(request, db)
+# Keyset cursors for the "show older" links: the recent tables order by
+# (assessment_date DESC, created_at DESC), so older pages continue from the
+# last row's pair via a row-value comparison instead of an OFFSET scan.
+def _assessment_cursor(row: Assessment) -> str:
+    return f"{row.assessment_date.isoformat()}~{row.created_at.isoformat()}"
+
+
+def _parse_assessment_cursor(raw_value: str | None) -> tuple[date, datetime] | None:
+    if not raw_value:
+        return None
+    date_part, separator, created_part = raw_value.partition("~")
+    if not separator:
+        return None
+    try:
+        return (
+            datetime.strptime(date_part, "%Y-%m-%d").date(),
+            datetime.fromisoformat(created_part),
+        )
+    except ValueError:
+        return None
+
+
+def _parse_created_cursor(raw_value: str | None) -> datetime | None:
+    if not raw_value:
+        return None
+    try:
+        return datetime.fromisoformat(raw_value)
+    except ValueError:
+        return None
+
+
+async def _require_roles(request: Request, db: AsyncSession, allowed_roles: set[str]):
+    user = await _current_user(request, db)
     if not user:
         _set_flash(request, "Сначала войдите в систему.")
         return None, RedirectResponse(url="/auth/login", status_code=303)
     if user.role not in allowed_roles:
-        context = _base_context(request, db)
+        context = await _base_context(request, db)
         context["required_roles"] = [
             context["role_labels"].get(role, role) for role in sorted(allowed_roles)
         ]
-        return user, templates.TemplateResponse(
+        return user, render_template(
             "forbidden.html",
             context,
             status_code=403,
@@ -90,105 +204,200 @@ def _require_roles(request: Request, db: Session, allowed_roles: set[str]):
     return user, None
 
 
-def _children_for_therapist(db: Session, therapist_id: str) -> list[Child]:
-    child_ids = db.execute(
-        select(ChildTherapistAssignment.child_id).where(
-            ChildTherapistAssignment.therapist_id == therapist_id
+async def _children_for_therapist(db: AsyncSession, therapist_id: str) -> list[Child]:
+    return (await db.execute(
+        select(Child)
+        .join(
+            ChildTherapistAssignment,
+            ChildTherapistAssignment.child_id == Child.id,
+        )
+        .where(ChildTherapistAssignment.therapist_id == therapist_id)
+        .order_by(Child.full_name.asc())
+    )).scalars().all()
+
+
+async def _authorized_child(db: AsyncSession, therapist_id: str, child_id: str) -> Child | None:
+    # One probe for the POST paths: returns the Child iff the therapist is
+    # assigned to it, so callers get the permission check and the row for
+    # audit text in a single round-trip.
+    return (await db.execute(
+        select(Child)
+        .join(
+            ChildTherapistAssignment,
+            ChildTherapistAssignment.child_id == Child.id,
         )
-    ).scalars().all()
-    if not child_ids:
-        return []
-    return db.execute(
-        select(Child).where(Child.id.in_(child_ids)).order_by(Child.full_name.asc())
-    ).scalars().all()
-
-
-def _children_for_parent(db: Session, parent_id: str) -> list[Child]:
-    child_ids = db.execute(
-        select(ChildParentAssignment.child_id).where(
-            ChildParentAssignment.parent_id == parent_id
+        .where(
+            ChildTherapistAssignment.therapist_id == therapist_id,
+            Child.id == child_id,
         )
-    ).scalars().all()
-    if not child_ids:
-        return []
-    return db.execute(
-        select(Child).where(Child.id.in_(child_ids)).order_by(Child.full_name.asc())
-    ).scalars().all()
+        .limit(1)
+    )).scalar_one_or_none()
 
 
-def _all_ablls_tasks(db: Session) -> list[ABLLSTask]:
-    return db.execute(
-        select(ABLLSTask).order_by(ABLLSTask.section_code.asc(), ABLLSTask.item_number.asc())
-    ).scalars().all()
+async def _children_for_parent(db: AsyncSession, parent_id: str) -> list[Child]:
+    return (await db.execute(
+        select(Child)
+        .join(
+            ChildParentAssignment,
+            ChildParentAssignment.child_id == Child.id,
+        )
+        .where(ChildParentAssignment.parent_id == parent_id)
+        .order_by(Child.full_name.asc())
+    )).scalars().all()
 
 
-def _section_options(tasks: list[ABLLSTask]) -> list[dict]:
-    seen = set()
-    options = []
-    for task in tasks:
-        if task.section_code in seen:
-            continue
-        seen.add(task.section_code)
-        options.append(
-            {
-                "code": task.section_code,
-                "name": SECTION_NAMES.get(task.section_code, task.section_name or task.section_code),
-            }
-        )
+# The ABLLS-R catalog is seeded once and never changes at runtime, yet almost
+# every page re-selected all ~500 rows and re-derived the same lookups from
+# them. Everything derived from the catalog lives in one cached bundle;
+# invalidate_catalog_cache() is called after (re)seeding.
+class Catalog(NamedTuple):
+    tasks: list[ABLLSTask]
+    sections: list[dict]
+    task_by_code: dict[str, ABLLSTask]
+    tasks_by_section: dict[str, list[ABLLSTask]]
+    codes_by_section: dict[str, frozenset[str]]
 
-    options.sort(
-        key=lambda item: SECTION_ORDER.index(item["code"]) if item["code"] in SECTION_ORDER else 999
-    )
-    return options
 
+_EMPTY_CATALOG = Catalog([], [], {}, {}, {})
+_catalog_cache: Catalog | None = None
+# Bumped on every invalidation; caches derived from catalog contents (the
+# knowledge-base fragments below) key on it so they roll over with the data.
+_catalog_version = 0
 
-def _latest_assessment_by_skill(db: Session, child_id: str) -> dict[str, Assessment]:
-    rows = db.execute(
-        select(Assessment)
-        .where(Assessment.child_id == child_id)
-        .order_by(Assessment.assessment_date.desc(), Assessment.created_at.desc())
-    ).scalars().all()
 
-    return _latest_assessment_by_skill_from_rows(rows)
+def invalidate_catalog_cache() -> None:
+    global _catalog_cache, _catalog_version
+    _catalog_cache = None
+    _catalog_version += 1
 
 
-def _latest_assessment_by_skill_from_rows(rows: list[Assessment]) -> dict[str, Assessment]:
+# Rendered knowledge-base bodies keyed by (section, catalog version); the
+# version key retires stale entries on reseed, the TTL bounds their lifetime.
+_KNOWLEDGE_BODY_TTL = 3600.0
+_knowledge_body_cache: dict[tuple[str | None, int], tuple[float, str]] = {}
+
+
+async def _get_catalog(db: AsyncSession) -> Catalog:
+    global _catalog_cache
+    catalog = _catalog_cache
+    if catalog is not None:
+        return catalog
+
+    tasks = (await db.execute(
+        select(ABLLSTask).order_by(ABLLSTask.section_code.asc(), ABLLSTask.item_number.asc())
+    )).scalars().all()
+    if not tasks:
+        # Startup hydration may still be running; don't pin an empty catalog.
+        return _EMPTY_CATALOG
+
+    task_by_code: dict[str, ABLLSTask] = {}
+    tasks_by_section: dict[str, list[ABLLSTask]] = {}
+    for task in tasks:
+        task_by_code[task.code] = task
+        tasks_by_section.setdefault(task.section_code, []).append(task)
+
+    sections = [
+        {
+            "code": section_code,
+            "name": SECTION_NAMES.get(
+                section_code, section_tasks[0].section_name or section_code
+            ),
+        }
+        for section_code, section_tasks in sorted(
+            tasks_by_section.items(),
+            key=lambda item: SECTION_POSITION.get(item[0], 999),
+        )
+    ]
+
+    codes_by_section = {
+        section_code: frozenset(task.code for task in section_tasks)
+        for section_code, section_tasks in tasks_by_section.items()
+    }
+
+    catalog = Catalog(tasks, sections, task_by_code, tasks_by_section, codes_by_section)
+    _catalog_cache = catalog
+    return catalog
+
+
+async def _latest_assessment_by_skill(db: AsyncSession, child_id: str) -> dict[str, Assessment]:
+    return await _latest_assessment_by_skill_where(db, [Assessment.child_id == child_id])
+
+
+async def _latest_assessment_by_skill_where(db: AsyncSession, conditions: list) -> dict[str, Assessment]:
+    # Rank per skill in SQL so only the newest row per skill crosses the
+    # wire, instead of the child's full assessment history. Callers pass the
+    # same condition list they use for their row queries, so filtered report
+    # views stay consistent.
+    ranked = (
+        select(
+            Assessment,
+            func.row_number()
+            .over(
+                partition_by=func.upper(func.trim(Assessment.area)),
+                order_by=(
+                    Assessment.assessment_date.desc(),
+                    Assessment.created_at.desc(),
+                ),
+            )
+            .label("row_rank"),
+        )
+        .where(*conditions)
+        .subquery()
+    )
+    latest = aliased(Assessment, ranked)
+    # Streamed in bounded batches and consumed straight into the dict; the
+    # full result never exists as a list. Rows arrive one-per-skill from
+    # the rank-1 window filter, so this is a straight mapping — no re-sort,
+    # no duplicate handling.
+    result = await db.stream(
+        select(latest).where(ranked.c.row_rank == 1),
+        execution_options={"yield_per": 256},
+    )
     latest_by_skill: dict[str, Assessment] = {}
-    for row in sorted(
-        rows,
-        key=lambda item: (item.assessment_date, item.created_at),
-        reverse=True,
-    ):
+    async for row in result.scalars():
         skill_code = (row.area or "").strip().upper()
-        if not skill_code or skill_code in latest_by_skill:
-            continue
-        latest_by_skill[skill_code] = row
+        if skill_code:
+            latest_by_skill[skill_code] = row
     return latest_by_skill
 
 
-def _section_progress_rows(
+# Maps _tracking_level_for_task classes onto tracking-total counters.
+_LEVEL_TOTAL_KEY = {
+    "ablls-level-none": "none",
+    "ablls-level-low": "low",
+    "ablls-level-mid": "mid",
+    "ablls-level-mastered-prompted": "mastered_prompted",
+    "ablls-level-mastered-independent": "mastered_independent",
+}
+
+
+def _compute_report_sections(
     tasks: list[ABLLSTask], latest_by_skill: dict[str, Assessment]
-) -> list[dict]:
-    section_stats: dict[str, dict] = defaultdict(
-        lambda: {
-            "section_name": "",
-            "total": 0,
-            "scored": 0,
-            "mastered": 0,
-            "relative_points": 0.0,
-            "max_points": 0.0,
-        }
-    )
+) -> tuple[list[dict], list[dict], dict]:
+    """One pass over the catalog that yields both the per-section summary
+    rows and the tracking grid; the two used to walk tasks separately and
+    resolve every latest assessment twice."""
+    section_stats: dict[str, dict] = {}
 
     for task in tasks:
-        stats = section_stats[task.section_code]
-        stats["section_name"] = SECTION_NAMES.get(
-            task.section_code, task.section_name or task.section_code
-        )
+        stats = section_stats.get(task.section_code)
+        if stats is None:
+            stats = section_stats[task.section_code] = {
+                "section_name": SECTION_NAMES.get(
+                    task.section_code, task.section_name or task.section_code
+                ),
+                "total": 0,
+                "scored": 0,
+                "mastered": 0,
+                "relative_points": 0.0,
+                "max_points": 0.0,
+                "items": {},
+            }
         stats["total"] += 1
         stats["max_points"] += float(task.max_score)
 
         latest = latest_by_skill.get(task.code)
+        stats["items"][task.item_number] = (task, latest)
         if latest is None:
             continue
 
@@ -197,85 +406,52 @@ def _section_progress_rows(
         if latest.score >= task.max_score:
             stats["mastered"] += 1
 
-    rows = []
-    for section_code, stats in section_stats.items():
+    section_rows: list[dict] = []
+    columns: list[dict] = []
+    totals = {
+        "none": 0,
+        "low": 0,
+        "mid": 0,
+        "mastered_prompted": 0,
+        "mastered_independent": 0,
+    }
+
+    for section_code in sorted(
+        section_stats, key=lambda code: SECTION_POSITION.get(code, 999)
+    ):
+        stats = section_stats[section_code]
+
         total = stats["total"] or 1
         mastered = stats["mastered"]
-        completion_pct = round((mastered / total) * 100, 1)
         score_pct = 0.0
         if stats["max_points"] > 0:
             score_pct = round((stats["relative_points"] / stats["max_points"]) * 100, 1)
-
-        rows.append(
+        section_rows.append(
             {
                 "section_code": section_code,
                 "section_name": stats["section_name"],
                 "total": stats["total"],
                 "scored": stats["scored"],
                 "mastered": mastered,
-                "completion_pct": completion_pct,
+                "completion_pct": round((mastered / total) * 100, 1),
                 "score_pct": score_pct,
             }
         )
 
-    rows.sort(
-        key=lambda item: SECTION_ORDER.index(item["section_code"])
-        if item["section_code"] in SECTION_ORDER
-        else 999
-    )
-    return rows
-
-
-def _tracking_level_for_task(task: ABLLSTask, latest: Assessment | None) -> tuple[str, str]:
-    if latest is None:
-        return "ablls-level-none", "Не оценено"
+        items = stats["items"]
+        max_item = max(items) if items else 0
+        # Dense grid indexed by item number: one None check per cell instead
+        # of a dict probe per cell.
+        grid: list[tuple | None] = [None] * max_item
+        for item_number, entry in items.items():
+            # Item 0 (workbook codes like "A0") never rendered under the old
+            # countdown loop; keep dropping it instead of clobbering grid[-1].
+            if item_number > 0:
+                grid[item_number - 1] = entry
 
-    max_score = max(int(task.max_score or 1), 1)
-    ratio = float(latest.score) / float(max_score)
-
-    if ratio >= 1.0:
-        if latest.is_prompted:
-            return "ablls-level-mastered-prompted", "Освоено с подсказкой"
-        return "ablls-level-mastered-independent", "Освоено самостоятельно"
-    if ratio >= 0.5:
-        return "ablls-level-mid", "В процессе (от 50%)"
-    return "ablls-level-low", "В процессе (до 50%)"
-
-
-def _tracking_columns(
-    tasks: list[ABLLSTask], latest_by_skill: dict[str, Assessment]
-) -> tuple[list[dict], dict]:
-    by_section: dict[str, dict[int, ABLLSTask]] = defaultdict(dict)
-    section_names: dict[str, str] = {}
-
-    for task in tasks:
-        by_section[task.section_code][task.item_number] = task
-        section_names[task.section_code] = SECTION_NAMES.get(
-            task.section_code, task.section_name or task.section_code
-        )
-
-    section_codes = sorted(
-        by_section.keys(),
-        key=lambda code: SECTION_ORDER.index(code) if code in SECTION_ORDER else 999,
-    )
-
-    columns: list[dict] = []
-    totals = {
-        "none": 0,
-        "low": 0,
-        "mid": 0,
-        "mastered_prompted": 0,
-        "mastered_independent": 0,
-    }
-
-    for section_code in section_codes:
-        section_tasks = by_section[section_code]
-        max_item = max(section_tasks.keys()) if section_tasks else 0
         rows: list[dict] = []
-
-        for item_number in range(max_item, 0, -1):
-            task = section_tasks.get(item_number)
-            if not task:
+        for entry in reversed(grid):
+            if entry is None:
                 rows.append(
                     {
                         "has_task": False,
@@ -286,18 +462,9 @@ def _tracking_columns(
                 )
                 continue
 
-            latest = latest_by_skill.get(task.code)
+            task, latest = entry
             level_class, level_label = _tracking_level_for_task(task, latest)
-            if level_class == "ablls-level-none":
-                totals["none"] += 1
-            elif level_class == "ablls-level-low":
-                totals["low"] += 1
-            elif level_class == "ablls-level-mid":
-                totals["mid"] += 1
-            elif level_class == "ablls-level-mastered-prompted":
-                totals["mastered_prompted"] += 1
-            elif level_class == "ablls-level-mastered-independent":
-                totals["mastered_independent"] += 1
+            totals[_LEVEL_TOTAL_KEY[level_class]] += 1
 
             if latest is None:
                 title = f"{task.code}: не оценено"
@@ -320,19 +487,122 @@ def _tracking_columns(
         columns.append(
             {
                 "section_code": section_code,
-                "section_name": section_names.get(section_code, section_code),
+                "section_name": stats["section_name"],
                 "rows": rows,
             }
         )
 
-    return columns, totals
+    return section_rows, columns, totals
+
+
+async def _section_progress_rows_sql(db: AsyncSession, child_id: str) -> list[dict]:
+    # SQL twin of _section_progress_rows for pages that don't otherwise load
+    # the child's assessments: one GROUP BY statement instead of shipping the
+    # latest-per-skill rows out and looping over the catalog in Python.
+    ranked = (
+        select(
+            Assessment.score,
+            func.upper(func.trim(Assessment.area)).label("skill_code"),
+            func.row_number()
+            .over(
+                partition_by=func.upper(func.trim(Assessment.area)),
+                order_by=(
+                    Assessment.assessment_date.desc(),
+                    Assessment.created_at.desc(),
+                ),
+            )
+            .label("row_rank"),
+        )
+        .where(Assessment.child_id == child_id)
+        .subquery()
+    )
+    latest = (
+        select(ranked.c.score, ranked.c.skill_code)
+        .where(ranked.c.row_rank == 1)
+        .subquery()
+    )
+    stats = (await db.execute(
+        select(
+            ABLLSTask.section_code,
+            func.min(ABLLSTask.section_name).label("section_name"),
+            func.count().label("total"),
+            func.count(latest.c.score).label("scored"),
+            func.coalesce(
+                func.sum(case((latest.c.score >= ABLLSTask.max_score, 1), else_=0)), 0
+            ).label("mastered"),
+            func.coalesce(func.sum(latest.c.score), 0).label("relative_points"),
+            func.sum(ABLLSTask.max_score).label("max_points"),
+        )
+        .outerjoin(latest, latest.c.skill_code == ABLLSTask.code)
+        .group_by(ABLLSTask.section_code)
+    )).all()
+
+    rows = []
+    for stat in stats:
+        total = stat.total or 1
+        completion_pct = round((stat.mastered / total) * 100, 1)
+        max_points = float(stat.max_points or 0)
+        score_pct = 0.0
+        if max_points > 0:
+            score_pct = round((float(stat.relative_points) / max_points) * 100, 1)
+
+        rows.append(
+            {
+                "section_code": stat.section_code,
+                "section_name": SECTION_NAMES.get(
+                    stat.section_code, stat.section_name or stat.section_code
+                ),
+                "total": stat.total,
+                "scored": stat.scored,
+                "mastered": stat.mastered,
+                "completion_pct": completion_pct,
+                "score_pct": score_pct,
+            }
+        )
+
+    rows.sort(key=lambda item: SECTION_POSITION.get(item["section_code"], 999))
+    return rows
+
+
+def _tracking_level_for_task(task: ABLLSTask, latest: Assessment | None) -> tuple[str, str]:
+    if latest is None:
+        return "ablls-level-none", "Не оценено"
+
+    max_score = max(int(task.max_score or 1), 1)
+    ratio = float(latest.score) / float(max_score)
+
+    if ratio >= 1.0:
+        if latest.is_prompted:
+            return "ablls-level-mastered-prompted", "Освоено с подсказкой"
+        return "ablls-level-mastered-independent", "Освоено самостоятельно"
+    if ratio >= 0.5:
+        return "ablls-level-mid", "В процессе (от 50%)"
+    return "ablls-level-low", "В процессе (до 50%)"
+
 
+_PDF_FONTS_LOCK = threading.Lock()
+# At most this many PDF renders run at once; further downloads queue on the
+# limiter instead of thrashing the CPU.
+_PDF_BUILD_LIMITER = anyio.CapacityLimiter(4)
 
-def _ensure_pdf_fonts() -> tuple[str, str]:
+
+def ensure_pdf_fonts() -> tuple[str, str]:
     global PDF_FONTS_READY, PDF_FONT_REGULAR, PDF_FONT_BOLD
     if PDF_FONTS_READY:
         return PDF_FONT_REGULAR, PDF_FONT_BOLD
 
+    with _PDF_FONTS_LOCK:
+        if PDF_FONTS_READY:
+            return PDF_FONT_REGULAR, PDF_FONT_BOLD
+        return _register_pdf_fonts()
+
+
+def _register_pdf_fonts() -> tuple[str, str]:
+    # Called once at startup (see app.main) with the lock held; registration
+    # probes the filesystem and writes module globals, neither of which
+    # belongs on a request path.
+    global PDF_FONTS_READY, PDF_FONT_REGULAR, PDF_FONT_BOLD
+
     candidates = [
         (
             "ABLLSRegular",
@@ -364,36 +634,87 @@ def _ensure_pdf_fonts() -> tuple[str, str]:
     return PDF_FONT_REGULAR, PDF_FONT_BOLD
 
 
+# Built once: HexColor parses its string argument, and the PDF builder needs
+# a color per tracking cell.
+_LEVEL_COLOR = {
+    "ablls-level-none": colors.HexColor("#F6F9FB"),
+    "ablls-level-low": colors.HexColor("#F3BFBA"),
+    "ablls-level-mid": colors.HexColor("#F5E4AA"),
+    "ablls-level-mastered-prompted": colors.HexColor("#BEDCF3"),
+    "ablls-level-mastered-independent": colors.HexColor("#BFE7C7"),
+    "ablls-level-gap": colors.HexColor("#F3F5F4"),
+}
+_PDF_INK_TITLE = colors.HexColor("#1E3444")
+_PDF_INK_LEGEND = colors.HexColor("#2E4C60")
+_PDF_INK_SUMMARY = colors.HexColor("#355062")
+_PDF_INK_EMPTY = colors.HexColor("#4A6271")
+_PDF_INK_CODE = colors.HexColor("#5C6E7B")
+_PDF_INK_SECTION = colors.HexColor("#24455C")
+_PDF_INK_TABLE_HEAD = colors.HexColor("#365062")
+_PDF_INK_TABLE = colors.HexColor("#344F61")
+_PDF_STROKE_CELL = colors.HexColor("#7A8F88")
+_PDF_STROKE_FRAME = colors.HexColor("#B7C9BF")
+_PDF_STROKE_ROW = colors.HexColor("#D0DDD6")
+_PDF_TABLE_HEAD_FILL = colors.HexColor("#E2F0E8")
+_PDF_TABLE_HEAD_STROKE = colors.HexColor("#AAC0B4")
+
+
 def _pdf_level_color(level_class: str):
-    color_map = {
-        "ablls-level-none": colors.HexColor("#F6F9FB"),
-        "ablls-level-low": colors.HexColor("#F3BFBA"),
-        "ablls-level-mid": colors.HexColor("#F5E4AA"),
-        "ablls-level-mastered-prompted": colors.HexColor("#BEDCF3"),
-        "ablls-level-mastered-independent": colors.HexColor("#BFE7C7"),
-        "ablls-level-gap": colors.HexColor("#F3F5F4"),
-    }
-    return color_map.get(level_class, colors.white)
+    return _LEVEL_COLOR.get(level_class, colors.white)
 
 
+_WS_RE = re.compile(r"\s+")
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+
+@functools.lru_cache(maxsize=4096)
 def _short_text(value: str, limit: int) -> str:
-    normalized = " ".join((value or "").split())
+    # Section names and table cells repeat across PDF pages; cache the
+    # normalized result per (value, limit).
+    normalized = _WS_RE.sub(" ", value).strip() if value else ""
     if len(normalized) <= limit:
         return normalized
     return f"{normalized[: max(1, limit - 1)]}..."
 
 
-def _report_payload(db: Session, query_params) -> dict:
-    visible_children = db.execute(select(Child).order_by(Child.full_name.asc())).scalars().all()
+async def _report_payload(db: AsyncSession, query_params) -> dict:
+    visible_children = (await db.execute(select(Child).order_by(Child.full_name.asc()))).scalars().all()
+
+    if not visible_children:
+        # Nothing to report on: skip the catalog pass and filter parsing.
+        return {
+            "visible_children": [],
+            "selected_child": None,
+            "selected_child_id": None,
+            "sections": [],
+            "selected_section": "ALL",
+            "selected_mode": "ALL",
+            "selected_skill_code": "",
+            "selected_date_from": "",
+            "selected_date_to": "",
+            "filtered_assessment_count": 0,
+            "section_rows": [],
+            "tracking_columns": [],
+            "tracking_totals": {
+                "none": 0,
+                "low": 0,
+                "mid": 0,
+                "mastered_prompted": 0,
+                "mastered_independent": 0,
+            },
+            "recent_assessments": [],
+            "daily_points": [],
+            "task_by_code": {},
+            "filtered_tasks_for_summary": [],
+            "latest_by_skill": {},
+        }
 
     selected_child_id = query_params.get("child_id")
-    visible_child_ids = {child.id for child in visible_children}
-    if selected_child_id not in visible_child_ids:
-        selected_child_id = visible_children[0].id if visible_children else None
+    visible_by_id = {child.id: child for child in visible_children}
+    if selected_child_id not in visible_by_id:
+        selected_child_id = visible_children[0].id
 
-    tasks = _all_ablls_tasks(db)
-    task_by_code = {task.code: task for task in tasks}
-    sections = _section_options(tasks)
+    tasks, sections, task_by_code, tasks_by_section, _ = await _get_catalog(db)
     valid_section_codes = {section["code"] for section in sections}
 
     selected_section = (query_params.get("section") or "ALL").strip().upper()
@@ -413,22 +734,25 @@ def _report_payload(db: Session, query_params) -> dict:
     if selected_date_from and selected_date_to and selected_date_from > selected_date_to:
         selected_date_from, selected_date_to = selected_date_to, selected_date_from
 
-    selected_child = next((child for child in visible_children if child.id == selected_child_id), None)
+    selected_child = visible_by_id.get(selected_child_id)
 
     recent_rows: list[Assessment] = []
     daily_points: list[dict] = []
     filtered_assessment_count = 0
     latest_by_skill: dict[str, Assessment] = {}
 
-    filtered_tasks_for_summary = tasks
+    # Start from the per-section index so other sections are never touched,
+    # and apply the skill prefix in the same pass.
     if selected_section != "ALL":
-        filtered_tasks_for_summary = [
-            task for task in filtered_tasks_for_summary if task.section_code == selected_section
-        ]
+        base_tasks = tasks_by_section.get(selected_section, [])
+    else:
+        base_tasks = tasks
     if selected_skill_code:
         filtered_tasks_for_summary = [
-            task for task in filtered_tasks_for_summary if task.code.startswith(selected_skill_code)
+            task for task in base_tasks if task.code.startswith(selected_skill_code)
         ]
+    else:
+        filtered_tasks_for_summary = base_tasks
 
     section_rows: list[dict] = []
     tracking_columns: list[dict] = []
@@ -440,61 +764,72 @@ def _report_payload(db: Session, query_params) -> dict:
         "mastered_independent": 0,
     }
     if selected_child:
-        query = select(Assessment).where(Assessment.child_id == selected_child.id)
+        # Shared by the row fetch and the daily aggregate below.
+        conditions = [Assessment.child_id == selected_child.id]
 
         if selected_date_from:
-            query = query.where(Assessment.assessment_date >= selected_date_from)
+            conditions.append(Assessment.assessment_date >= selected_date_from)
         if selected_date_to:
-            query = query.where(Assessment.assessment_date <= selected_date_to)
+            conditions.append(Assessment.assessment_date <= selected_date_to)
 
         if selected_mode == "independent":
-            query = query.where(Assessment.is_prompted.is_(False))
+            conditions.append(Assessment.is_prompted.is_(False))
         elif selected_mode == "prompted":
-            query = query.where(Assessment.is_prompted.is_(True))
+            conditions.append(Assessment.is_prompted.is_(True))
 
         if selected_section != "ALL" or selected_skill_code:
-            filtered_skill_codes = [task.code for task in filtered_tasks_for_summary]
-            if filtered_skill_codes:
-                query = query.where(Assessment.area.in_(filtered_skill_codes))
-            else:
-                query = query.where(Assessment.area == "__NO_MATCH__")
+            # Membership via a catalog subquery: no per-request list of
+            # hundreds of bound codes, and the statement shape stays stable
+            # across requests. An empty match set naturally yields no rows.
+            code_query = select(ABLLSTask.code)
+            if selected_section != "ALL":
+                code_query = code_query.where(ABLLSTask.section_code == selected_section)
+            if selected_skill_code:
+                # autoescape keeps LIKE wildcards in the query string literal,
+                # matching the str.startswith filter on the catalog side.
+                code_query = code_query.where(
+                    ABLLSTask.code.startswith(selected_skill_code, autoescape=True)
+                )
+            conditions.append(Assessment.area.in_(code_query))
+
+        query = select(Assessment).where(*conditions)
 
-        recent_rows = db.execute(
+        recent_rows = (await db.execute(
             query.order_by(Assessment.assessment_date.desc(), Assessment.created_at.desc()).limit(80)
-        ).scalars().all()
+        )).scalars().all()
 
-        all_rows = db.execute(
-            query.order_by(Assessment.assessment_date.asc(), Assessment.created_at.asc())
-        ).scalars().all()
-        filtered_assessment_count = len(all_rows)
+        filtered_assessment_count = await db.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
 
-        latest_by_skill = _latest_assessment_by_skill_from_rows(all_rows)
-        section_rows = _section_progress_rows(filtered_tasks_for_summary, latest_by_skill)
-        tracking_columns, tracking_totals = _tracking_columns(
+        latest_by_skill = await _latest_assessment_by_skill_where(db, conditions)
+        section_rows, tracking_columns, tracking_totals = _compute_report_sections(
             filtered_tasks_for_summary,
             latest_by_skill,
         )
 
-        by_day: dict[str, dict[str, int]] = defaultdict(
-            lambda: {"independent": 0, "prompted": 0}
-        )
-        for row in all_rows:
-            if row.score <= 0:
-                continue
-            day_key = row.assessment_date.isoformat()
-            if row.is_prompted:
-                by_day[day_key]["prompted"] += 1
-            else:
-                by_day[day_key]["independent"] += 1
+        # Grouped in SQL: O(days) result rows instead of re-bucketing every
+        # assessment in Python.
+        daily_rows = (await db.execute(
+            select(
+                Assessment.assessment_date,
+                Assessment.is_prompted,
+                func.count().label("points"),
+            )
+            .where(*conditions, Assessment.score > 0)
+            .group_by(Assessment.assessment_date, Assessment.is_prompted)
+            .order_by(Assessment.assessment_date.asc())
+        )).all()
+
+        by_day: dict[str, dict] = {}
+        for assessment_date, is_prompted, points in daily_rows:
+            day = assessment_date.isoformat()
+            entry = by_day.setdefault(
+                day, {"date": day, "independent": 0, "prompted": 0}
+            )
+            entry["prompted" if is_prompted else "independent"] = points
 
-        daily_points = [
-            {
-                "date": day,
-                "independent": values["independent"],
-                "prompted": values["prompted"],
-            }
-            for day, values in sorted(by_day.items(), key=lambda item: item[0])
-        ]
+        daily_points = list(by_day.values())
 
     return {
         "visible_children": visible_children,
@@ -518,11 +853,13 @@ def _report_payload(db: Session, query_params) -> dict:
     }
 
 
-def _build_report_pdf(payload: dict) -> bytes:
-    regular_font, bold_font = _ensure_pdf_fonts()
+def _build_report_pdf(payload: dict) -> tempfile.SpooledTemporaryFile:
+    regular_font, bold_font = ensure_pdf_fonts()
     page_width, page_height = landscape(A4)
     margin = 24.0
-    buffer = io.BytesIO()
+    # Small reports stay in memory; multi-page documents spill to disk past
+    # 1 MiB instead of pinning the whole render per concurrent request.
+    buffer = tempfile.SpooledTemporaryFile(max_size=1 << 20)
     pdf = pdf_canvas.Canvas(buffer, pagesize=landscape(A4))
 
     selected_child = payload["selected_child"]
@@ -551,22 +888,34 @@ def _build_report_pdf(payload: dict) -> bytes:
         filters.append(f"По: {selected_date_to}")
 
     legend_rows = [
-        ("ablls-level-none", f"Не оценено ({tracking_totals['none']})"),
-        ("ablls-level-low", f"До 50% ({tracking_totals['low']})"),
-        ("ablls-level-mid", f"От 50% до максимума ({tracking_totals['mid']})"),
+        (_LEVEL_COLOR["ablls-level-none"], f"Не оценено ({tracking_totals['none']})"),
+        (_LEVEL_COLOR["ablls-level-low"], f"До 50% ({tracking_totals['low']})"),
+        (_LEVEL_COLOR["ablls-level-mid"], f"От 50% до максимума ({tracking_totals['mid']})"),
         (
-            "ablls-level-mastered-prompted",
+            _LEVEL_COLOR["ablls-level-mastered-prompted"],
             f"Освоено с подсказкой ({tracking_totals['mastered_prompted']})",
         ),
         (
-            "ablls-level-mastered-independent",
+            _LEVEL_COLOR["ablls-level-mastered-independent"],
             f"Освоено самостоятельно ({tracking_totals['mastered_independent']})",
         ),
     ]
 
+    # Page-invariant header strings, formatted once for the whole document.
+    filter_text = ", ".join(filters) if filters else "Без дополнительных фильтров"
+    total_skills = len(filtered_tasks)
+    assessed = total_skills - tracking_totals["none"]
+    in_progress = tracking_totals["low"] + tracking_totals["mid"]
+    summary_text = (
+        f"Всего навыков: {total_skills}    Оценено: {assessed}    "
+        f"В процессе: {in_progress}    "
+        f"Освоено сам.: {tracking_totals['mastered_independent']}    "
+        f"Освоено с подсказкой: {tracking_totals['mastered_prompted']}"
+    )
+
     def draw_header(title_suffix: str = "") -> float:
         y = page_height - margin
-        pdf.setFillColor(colors.HexColor("#1E3444"))
+        pdf.setFillColor(_PDF_INK_TITLE)
         pdf.setFont(bold_font, 14)
         pdf.drawString(margin, y, "ABLLS-R Skills Tracking Report")
         if title_suffix:
@@ -581,44 +930,34 @@ def _build_report_pdf(payload: dict) -> bytes:
 
         y -= 13
         pdf.setFont(regular_font, 8.5)
-        filter_text = ", ".join(filters) if filters else "Без дополнительных фильтров"
         pdf.drawString(margin, y, f"Фильтры: {filter_text}")
 
         y -= 14
         x = margin
-        for level_class, label in legend_rows:
+        for legend_color, label in legend_rows:
             item_width = 118
             if x + item_width > page_width - margin:
                 x = margin
                 y -= 12
-            pdf.setFillColor(_pdf_level_color(level_class))
-            pdf.setStrokeColor(colors.HexColor("#7A8F88"))
+            pdf.setFillColor(legend_color)
+            pdf.setStrokeColor(_PDF_STROKE_CELL)
             pdf.rect(x, y - 8, 10, 10, fill=1, stroke=1)
-            pdf.setFillColor(colors.HexColor("#2E4C60"))
+            pdf.setFillColor(_PDF_INK_LEGEND)
             pdf.setFont(regular_font, 7.6)
             pdf.drawString(x + 14, y - 1, label)
             x += item_width
 
         y -= 17
-        total_skills = len(filtered_tasks)
-        assessed = total_skills - tracking_totals["none"]
-        in_progress = tracking_totals["low"] + tracking_totals["mid"]
-        summary = (
-            f"Всего навыков: {total_skills}    Оценено: {assessed}    "
-            f"В процессе: {in_progress}    "
-            f"Освоено сам.: {tracking_totals['mastered_independent']}    "
-            f"Освоено с подсказкой: {tracking_totals['mastered_prompted']}"
-        )
-        pdf.setFillColor(colors.HexColor("#355062"))
+        pdf.setFillColor(_PDF_INK_SUMMARY)
         pdf.setFont(regular_font, 8.4)
-        pdf.drawString(margin, y, summary)
+        pdf.drawString(margin, y, summary_text)
         return y - 12
 
     map_columns = tracking_columns or []
     if not map_columns:
         map_top = draw_header()
         pdf.setFont(regular_font, 11)
-        pdf.setFillColor(colors.HexColor("#4A6271"))
+        pdf.setFillColor(_PDF_INK_EMPTY)
         pdf.drawString(margin, map_top - 20, "Нет данных для построения карты навыков.")
     else:
         start = 0
@@ -645,7 +984,7 @@ def _build_report_pdf(payload: dict) -> bytes:
             cell_height = max(4.0, min(8.3, (available_height - 18) / max_rows))
             row_step = cell_height + 0.8
 
-            pdf.setStrokeColor(colors.HexColor("#B7C9BF"))
+            pdf.setStrokeColor(_PDF_STROKE_FRAME)
             pdf.rect(
                 margin - 4,
                 map_bottom - 18,
@@ -655,33 +994,51 @@ def _build_report_pdf(payload: dict) -> bytes:
                 stroke=1,
             )
 
+            # Collect geometry first, then draw in color/font batches: one
+            # state change per group instead of several per cell.
+            code_labels: list[tuple[float, float, str]] = []
+            section_labels: list[tuple[float, str, str]] = []
+            cell_buckets: dict[str, list[tuple[float, float]]] = defaultdict(list)
             for idx, column in enumerate(chunk):
                 x = margin + (idx * column_width)
                 rows = [row for row in column["rows"] if row.get("has_task")]
-                pdf.setFont(regular_font, 5.6)
                 for row_idx, row in enumerate(rows):
                     y = map_top - (row_idx * row_step) - cell_height
-                    pdf.setFillColor(colors.HexColor("#5C6E7B"))
-                    pdf.drawRightString(x + code_width - 2, y + (cell_height * 0.2), row["code"])
-                    pdf.setFillColor(_pdf_level_color(row["level_class"]))
-                    pdf.setStrokeColor(colors.HexColor("#7A8F88"))
-                    pdf.rect(x + code_width, y, cell_width, cell_height, fill=1, stroke=1)
-
-                label_center = x + code_width + (cell_width / 2)
-                pdf.setFillColor(colors.HexColor("#24455C"))
-                pdf.setFont(bold_font, 7.2)
-                pdf.drawCentredString(label_center, map_bottom - 9, column["section_code"])
-                pdf.setFont(regular_font, 5.6)
-                pdf.drawCentredString(
-                    label_center,
-                    map_bottom - 17,
-                    _short_text(column["section_name"], 16),
+                    code_labels.append(
+                        (x + code_width - 2, y + (cell_height * 0.2), row["code"])
+                    )
+                    cell_buckets[row["level_class"]].append((x + code_width, y))
+                section_labels.append(
+                    (
+                        x + code_width + (cell_width / 2),
+                        column["section_code"],
+                        _short_text(column["section_name"], 16),
+                    )
                 )
+
+            pdf.setStrokeColor(_PDF_STROKE_CELL)
+            for level_class, cells in cell_buckets.items():
+                pdf.setFillColor(_pdf_level_color(level_class))
+                for cell_x, cell_y in cells:
+                    pdf.rect(cell_x, cell_y, cell_width, cell_height, fill=1, stroke=1)
+
+            pdf.setFillColor(_PDF_INK_CODE)
+            pdf.setFont(regular_font, 5.6)
+            for label_x, label_y, code in code_labels:
+                pdf.drawRightString(label_x, label_y, code)
+
+            pdf.setFillColor(_PDF_INK_SECTION)
+            pdf.setFont(bold_font, 7.2)
+            for label_center, section_code, _section_name in section_labels:
+                pdf.drawCentredString(label_center, map_bottom - 9, section_code)
+            pdf.setFont(regular_font, 5.6)
+            for label_center, _section_code, section_name in section_labels:
+                pdf.drawCentredString(label_center, map_bottom - 17, section_name)
             page_index += 1
 
     pdf.showPage()
     y = page_height - margin
-    pdf.setFillColor(colors.HexColor("#1E3444"))
+    pdf.setFillColor(_PDF_INK_TITLE)
     pdf.setFont(bold_font, 14)
     pdf.drawString(margin, y, "Сводка прогресса по разделам")
     pdf.setFont(regular_font, 9)
@@ -712,11 +1069,11 @@ def _build_report_pdf(payload: dict) -> bytes:
     table_right = table_x + sum(col_widths)
 
     def draw_table_header(current_y: float) -> float:
-        pdf.setFillColor(colors.HexColor("#E2F0E8"))
-        pdf.setStrokeColor(colors.HexColor("#AAC0B4"))
+        pdf.setFillColor(_PDF_TABLE_HEAD_FILL)
+        pdf.setStrokeColor(_PDF_TABLE_HEAD_STROKE)
         pdf.rect(table_x, current_y - row_height, table_right - table_x, row_height, fill=1, stroke=1)
         cursor_x = table_x
-        pdf.setFillColor(colors.HexColor("#365062"))
+        pdf.setFillColor(_PDF_INK_TABLE_HEAD)
         pdf.setFont(bold_font, 8)
         for header, width in zip(table_headers, col_widths):
             pdf.drawString(cursor_x + 3, current_y - 10.5, header)
@@ -729,7 +1086,7 @@ def _build_report_pdf(payload: dict) -> bytes:
         if y < margin + 24:
             pdf.showPage()
             y = page_height - margin
-            pdf.setFillColor(colors.HexColor("#1E3444"))
+            pdf.setFillColor(_PDF_INK_TITLE)
             pdf.setFont(bold_font, 11)
             pdf.drawString(margin, y, "Сводка прогресса по разделам (продолжение)")
             y -= 16
@@ -745,10 +1102,10 @@ def _build_report_pdf(payload: dict) -> bytes:
             str(row["score_pct"]),
         ]
         pdf.setFillColor(colors.white)
-        pdf.setStrokeColor(colors.HexColor("#D0DDD6"))
+        pdf.setStrokeColor(_PDF_STROKE_ROW)
         pdf.rect(table_x, y - row_height, table_right - table_x, row_height, fill=1, stroke=1)
         cursor_x = table_x
-        pdf.setFillColor(colors.HexColor("#344F61"))
+        pdf.setFillColor(_PDF_INK_TABLE)
         for value, width in zip(values, col_widths):
             pdf.drawString(cursor_x + 3, y - 10.5, _short_text(value, 46))
             cursor_x += width
@@ -756,12 +1113,19 @@ def _build_report_pdf(payload: dict) -> bytes:
 
     pdf.save()
     buffer.seek(0)
-    return buffer.getvalue()
+    return buffer
 
 
 @router.get("/")
-def index(request: Request, db: Session = Depends(get_db)):
-    return templates.TemplateResponse("index.html", _base_context(request, db))
+async def index(request: Request):
+    # Anonymous landings never need the database, and signed-in visitors
+    # normally render from the session identity alone; the session opened
+    # below only serves the legacy-cookie fallback (and is lazy, so it
+    # connects only if that fallback actually runs).
+    if not request.session.get("user_id"):
+        return render_template("index.html", await _base_context(request, None))
+    async with AsyncSessionLocal() as db:
+        return render_template("index.html", await _base_context(request, db))
 
 
 @router.get("/favicon.ico", include_in_schema=False)
@@ -770,71 +1134,61 @@ def favicon():
 
 
 @router.get("/dashboard")
-def dashboard(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin", "therapist", "parent"})
+async def dashboard(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin", "therapist", "parent"})
     if response:
         return response
-    return templates.TemplateResponse("dashboard.html", _base_context(request, db))
+    return render_template("dashboard.html", await _base_context(request, db))
 
 
 @router.get("/children")
-def children(request: Request, db: Session = Depends(get_db)):
-    user, response = _require_roles(request, db, {"admin", "therapist"})
+async def children(request: Request, db: AsyncSession = Depends(get_async_db)):
+    user, response = await _require_roles(request, db, {"admin", "therapist"})
     if response:
         return response
 
-    context = _base_context(request, db)
+    context = await _base_context(request, db)
     if user.role == "admin":
-        children_list = db.execute(
-            select(Child).order_by(Child.created_at.desc())
-        ).scalars().all()
-        therapists = db.execute(
+        children_list = (await db.execute(
+            select(Child)
+            # raiseload turns any relationship the eager loads miss into a
+            # loud error instead of a silent per-row SELECT from the template.
+            .options(
+                selectinload(Child.therapists),
+                selectinload(Child.parents),
+                raiseload("*"),
+            )
+            .order_by(Child.created_at.desc())
+        )).scalars().all()
+        therapists = (await db.execute(
             select(User).where(User.role == "therapist").order_by(User.full_name.asc())
-        ).scalars().all()
-        parents = db.execute(
+        )).scalars().all()
+        parents = (await db.execute(
             select(User).where(User.role == "parent").order_by(User.full_name.asc())
-        ).scalars().all()
-        t_assignments = db.execute(select(ChildTherapistAssignment)).scalars().all()
-        p_assignments = db.execute(select(ChildParentAssignment)).scalars().all()
-
-        therapist_map = {u.id: u for u in therapists}
-        parent_map = {u.id: u for u in parents}
-        child_therapists: dict[str, list[User]] = {c.id: [] for c in children_list}
-        child_parents: dict[str, list[User]] = {c.id: [] for c in children_list}
-
-        for row in t_assignments:
-            therapist = therapist_map.get(row.therapist_id)
-            if therapist and row.child_id in child_therapists:
-                child_therapists[row.child_id].append(therapist)
-        for row in p_assignments:
-            parent = parent_map.get(row.parent_id)
-            if parent and row.child_id in child_parents:
-                child_parents[row.child_id].append(parent)
+        )).scalars().all()
 
         context.update(
             {
                 "children_list": children_list,
                 "therapists": therapists,
                 "parents": parents,
-                "child_therapists": child_therapists,
-                "child_parents": child_parents,
             }
         )
     else:
-        context["assigned_children"] = _children_for_therapist(db, user.id)
+        context["assigned_children"] = await _children_for_therapist(db, user.id)
 
-    return templates.TemplateResponse("children.html", context)
+    return render_template("children.html", context)
 
 
 @router.post("/children")
-def create_child(
+async def create_child(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     full_name: str = Form(...),
     birth_date: str = Form(""),
     notes: str = Form(""),
 ):
-    user, response = _require_roles(request, db, {"admin"})
+    user, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
@@ -850,96 +1204,114 @@ def create_child(
         created_by=user.id,
     )
     db.add(child)
-    _log_action(db, user.id, "create_child", f"Создан ребенок: {name}")
-    db.commit()
+    await _log_action(db, user.id, "create_child", f"Создан ребенок: {name}")
+    await db.commit()
     _set_flash(request, "Ребенок добавлен.")
     return RedirectResponse(url="/children", status_code=303)
 
 
 @router.post("/children/{child_id}/assign-therapist")
-def assign_therapist(
+async def assign_therapist(
     child_id: str,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     therapist_id: str = Form(...),
 ):
-    user, response = _require_roles(request, db, {"admin"})
+    user, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    child = db.get(Child, child_id)
-    therapist = db.get(User, therapist_id)
-    if not child or not therapist or therapist.role != "therapist":
+    # One round-trip validates both ids and fetches the audit-text fields;
+    # a missing child or therapist comes back as a NULL column.
+    target = (await db.execute(
+        select(
+            select(Child.full_name)
+            .where(Child.id == child_id)
+            .scalar_subquery()
+            .label("full_name"),
+            select(User.email)
+            .where(User.id == therapist_id, User.role == "therapist")
+            .scalar_subquery()
+            .label("email"),
+        )
+    )).one()
+    if target.full_name is None or target.email is None:
         _set_flash(request, "Некорректный ребенок или терапист.")
         return RedirectResponse(url="/children", status_code=303)
 
-    exists = db.execute(
-        select(ChildTherapistAssignment).where(
-            ChildTherapistAssignment.child_id == child_id,
-            ChildTherapistAssignment.therapist_id == therapist_id,
-        )
-    ).scalar_one_or_none()
-    if not exists:
-        db.add(ChildTherapistAssignment(child_id=child_id, therapist_id=therapist_id))
-        _log_action(
+    # The unique constraint arbitrates duplicates, so there is no SELECT
+    # that a concurrent assignment could race past.
+    inserted = await db.execute(
+        sqlite_insert(ChildTherapistAssignment)
+        .values(child_id=child_id, therapist_id=therapist_id)
+        .on_conflict_do_nothing(index_elements=["child_id", "therapist_id"])
+    )
+    if inserted.rowcount:
+        await _log_action(
             db,
             user.id,
             "assign_therapist",
-            f"Назначен терапист {therapist.email} ребенку {child.full_name}",
+            f"Назначен терапист {target.email} ребенку {target.full_name}",
         )
-        db.commit()
+        await db.commit()
     _set_flash(request, "Терапист назначен.")
     return RedirectResponse(url="/children", status_code=303)
 
 
 @router.post("/children/{child_id}/assign-parent")
-def assign_parent(
+async def assign_parent(
     child_id: str,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     parent_id: str = Form(...),
 ):
-    user, response = _require_roles(request, db, {"admin"})
+    user, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    child = db.get(Child, child_id)
-    parent = db.get(User, parent_id)
-    if not child or not parent or parent.role != "parent":
+    target = (await db.execute(
+        select(
+            select(Child.full_name)
+            .where(Child.id == child_id)
+            .scalar_subquery()
+            .label("full_name"),
+            select(User.email)
+            .where(User.id == parent_id, User.role == "parent")
+            .scalar_subquery()
+            .label("email"),
+        )
+    )).one()
+    if target.full_name is None or target.email is None:
         _set_flash(request, "Некорректный ребенок или родитель.")
         return RedirectResponse(url="/children", status_code=303)
 
-    exists = db.execute(
-        select(ChildParentAssignment).where(
-            ChildParentAssignment.child_id == child_id,
-            ChildParentAssignment.parent_id == parent_id,
-        )
-    ).scalar_one_or_none()
-    if not exists:
-        db.add(ChildParentAssignment(child_id=child_id, parent_id=parent_id))
-        _log_action(
+    inserted = await db.execute(
+        sqlite_insert(ChildParentAssignment)
+        .values(child_id=child_id, parent_id=parent_id)
+        .on_conflict_do_nothing(index_elements=["child_id", "parent_id"])
+    )
+    if inserted.rowcount:
+        await _log_action(
             db,
             user.id,
             "assign_parent",
-            f"Назначен родитель {parent.email} ребенку {child.full_name}",
+            f"Назначен родитель {target.email} ребенку {target.full_name}",
         )
-        db.commit()
+        await db.commit()
     _set_flash(request, "Родитель назначен.")
     return RedirectResponse(url="/children", status_code=303)
 
 
 @router.get("/assessments")
-def assessments(request: Request, db: Session = Depends(get_db)):
-    user, response = _require_roles(request, db, {"therapist"})
+async def assessments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    user, response = await _require_roles(request, db, {"therapist"})
     if response:
         return response
 
-    assigned_children = _children_for_therapist(db, user.id)
+    assigned_children = await _children_for_therapist(db, user.id)
     assigned_child_ids = {child.id for child in assigned_children}
 
-    tasks = _all_ablls_tasks(db)
-    task_by_code = {task.code: task for task in tasks}
-    sections = _section_options(tasks)
+    tasks, sections, task_by_code, tasks_by_section, _ = await _get_catalog(db)
 
     selected_child_id = request.query_params.get("child_id")
     if selected_child_id not in assigned_child_ids:
@@ -950,22 +1322,32 @@ def assessments(request: Request, db: Session = Depends(get_db)):
     if selected_section not in valid_sections:
         selected_section = sections[0]["code"] if sections else None
 
-    section_tasks = [
-        task for task in tasks if selected_section and task.section_code == selected_section
-    ]
+    section_tasks = tasks_by_section.get(selected_section, []) if selected_section else []
+
+    before = _parse_assessment_cursor(request.query_params.get("before"))
 
     latest_by_skill = {}
     recent_rows: list[Assessment] = []
+    older_assessments_url = None
     if selected_child_id:
-        latest_by_skill = _latest_assessment_by_skill(db, selected_child_id)
-        recent_rows = db.execute(
-            select(Assessment)
-            .where(Assessment.child_id == selected_child_id)
+        latest_by_skill = await _latest_assessment_by_skill(db, selected_child_id)
+        recent_query = select(Assessment).where(Assessment.child_id == selected_child_id)
+        if before:
+            recent_query = recent_query.where(
+                tuple_(Assessment.assessment_date, Assessment.created_at) < before
+            )
+        recent_rows = (await db.execute(
+            recent_query
             .order_by(Assessment.assessment_date.desc(), Assessment.created_at.desc())
             .limit(80)
-        ).scalars().all()
+        )).scalars().all()
+        if len(recent_rows) == 80:
+            older_assessments_url = (
+                f"/assessments?child_id={selected_child_id}&section={selected_section}"
+                f"&before={_assessment_cursor(recent_rows[-1])}"
+            )
 
-    context = _base_context(request, db)
+    context = await _base_context(request, db)
     context.update(
         {
             "assigned_children": assigned_children,
@@ -976,15 +1358,16 @@ def assessments(request: Request, db: Session = Depends(get_db)):
             "task_by_code": task_by_code,
             "latest_by_skill": latest_by_skill,
             "recent_assessments": recent_rows,
+            "older_assessments_url": older_assessments_url,
         }
     )
-    return templates.TemplateResponse("assessments.html", context)
+    return stream_template("assessments.html", context)
 
 
 @router.post("/assessments")
-def create_assessment(
+async def create_assessment(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     child_id: str = Form(...),
     skill_code: str = Form(...),
     score: int = Form(...),
@@ -992,16 +1375,16 @@ def create_assessment(
     assessment_date: str = Form(...),
     comment: str = Form(""),
 ):
-    user, response = _require_roles(request, db, {"therapist"})
+    user, response = await _require_roles(request, db, {"therapist"})
     if response:
         return response
 
-    allowed_child_ids = {child.id for child in _children_for_therapist(db, user.id)}
-    if child_id not in allowed_child_ids:
+    child = await _authorized_child(db, user.id, child_id)
+    if not child:
         _set_flash(request, "Вы можете оценивать только назначенных вам детей.")
         return RedirectResponse(url="/assessments", status_code=303)
 
-    task = db.get(ABLLSTask, skill_code.strip().upper())
+    task = await db.get(ABLLSTask, skill_code.strip().upper())
     if not task:
         _set_flash(request, "Навык ABLLS-R не найден.")
         return RedirectResponse(url="/assessments", status_code=303)
@@ -1021,13 +1404,46 @@ def create_assessment(
             status_code=303,
         )
 
-    existing_assessment_id = db.execute(
-        select(Assessment.id).where(
-            Assessment.child_id == child_id,
-            Assessment.area == task.code,
+    # Captured before the INSERT: a rollback on the duplicate path expires
+    # the task instance, and refreshing expired attributes on an
+    # AsyncSession outside a greenlet raises MissingGreenlet.
+    task_code = task.code
+    section_code = task.section_code
+
+    # An approved edit request legitimately adds a second row for the same
+    # (child, area), so a unique constraint cannot police first entries.
+    # Instead the guard and the INSERT run as one conditional statement:
+    # the row only lands if no assessment for the skill exists yet, which
+    # also closes the check-then-insert race between concurrent submissions.
+    inserted = await db.execute(
+        insert(Assessment).from_select(
+            [
+                "child_id",
+                "therapist_id",
+                "area",
+                "score",
+                "is_prompted",
+                "assessment_date",
+                "comment",
+            ],
+            select(
+                literal(child_id),
+                literal(user.id),
+                literal(task_code),
+                literal(score),
+                literal(is_prompted),
+                literal(parsed_date),
+                literal(comment.strip() or None),
+            ).where(
+                ~exists().where(
+                    Assessment.child_id == child_id,
+                    Assessment.area == task_code,
+                )
+            ),
         )
-    ).scalar_one_or_none()
-    if existing_assessment_id:
+    )
+    if inserted.rowcount == 0:
+        await db.rollback()
         _set_flash(
             request,
             (
@@ -1036,48 +1452,31 @@ def create_assessment(
             ),
         )
         return RedirectResponse(
-            url=f"/requests?section={task.section_code}&child_id={child_id}&skill_code={task.code}",
+            url=f"/requests?section={section_code}&child_id={child_id}&skill_code={task_code}",
             status_code=303,
         )
-
-    db.add(
-        Assessment(
-            child_id=child_id,
-            therapist_id=user.id,
-            area=task.code,
-            score=score,
-            is_prompted=is_prompted,
-            assessment_date=parsed_date,
-            comment=comment.strip() or None,
-        )
-    )
-    child = db.get(Child, child_id)
     mode_label = "с подсказкой" if is_prompted else "самостоятельно"
-    _log_action(
+    await _log_action(
         db,
         user.id,
         "create_assessment",
-        (
-            f"Оценка ABLLS-R {task.code}={score} ({mode_label}) "
-            f"для {child.full_name if child else child_id}"
-        ),
+        f"Оценка ABLLS-R {task_code}={score} ({mode_label}) для {child.full_name}",
     )
-    db.commit()
+    await db.commit()
     _set_flash(request, "Оценка по навыку ABLLS-R сохранена.")
     return RedirectResponse(
-        url=f"/assessments?child_id={child_id}&section={task.section_code}",
+        url=f"/assessments?child_id={child_id}&section={section_code}",
         status_code=303,
     )
 
 
 @router.get("/knowledge-base")
-def knowledge_base(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin", "therapist", "parent"})
+async def knowledge_base(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin", "therapist", "parent"})
     if response:
         return response
 
-    tasks = _all_ablls_tasks(db)
-    sections = _section_options(tasks)
+    tasks, sections, _, tasks_by_section, _ = await _get_catalog(db)
 
     section_codes = {section["code"] for section in sections}
     selected_section = request.query_params.get("section")
@@ -1086,130 +1485,188 @@ def knowledge_base(request: Request, db: Session = Depends(get_db)):
     else:
         if selected_section not in section_codes:
             selected_section = sections[0]["code"] if sections else "ALL"
-        filtered_tasks = [task for task in tasks if task.section_code == selected_section]
+        filtered_tasks = tasks_by_section.get(selected_section, [])
+
+    # The body is a pure function of (section, catalog), identical for every
+    # user — render it once and reuse the HTML; only the shell with the nav
+    # chrome is rendered per request.
+    cache_key = (selected_section, _catalog_version)
+    now = time.monotonic()
+    cached = _knowledge_body_cache.get(cache_key)
+    if cached is not None and cached[0] > now:
+        knowledge_body = cached[1]
+    else:
+        knowledge_body = _tpl("knowledge_base_body.html").render(
+            {
+                "sections": sections,
+                "selected_section": selected_section,
+                "knowledge_tasks": filtered_tasks,
+                "knowledge_total": len(tasks),
+                "knowledge_visible": len(filtered_tasks),
+            }
+        )
+        if tasks:
+            # One entry per section plus ALL; the size guard only matters if
+            # the catalog ever grows new sections between invalidations.
+            if len(_knowledge_body_cache) >= 32:
+                _knowledge_body_cache.clear()
+            _knowledge_body_cache[cache_key] = (now + _KNOWLEDGE_BODY_TTL, knowledge_body)
 
-    context = _base_context(request, db)
-    context.update(
-        {
-            "sections": sections,
-            "selected_section": selected_section,
-            "knowledge_tasks": filtered_tasks,
-            "knowledge_total": len(tasks),
-            "knowledge_visible": len(filtered_tasks),
-        }
-    )
-    return templates.TemplateResponse("knowledge_base.html", context)
+    context = await _base_context(request, db)
+    context["knowledge_body"] = knowledge_body
+    return render_template("knowledge_base.html", context)
 
 
 @router.get("/reports")
-def reports(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin", "therapist", "parent"})
+async def reports(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin", "therapist", "parent"})
     if response:
         return response
 
-    report_data = _report_payload(db, request.query_params)
-    context = _base_context(request, db)
+    report_data = await _report_payload(db, request.query_params)
+    context = await _base_context(request, db)
     context.update(report_data)
-    return templates.TemplateResponse("reports.html", context)
+    return stream_template("reports.html", context)
 
 
 @router.get("/reports/pdf")
-def reports_pdf(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin", "therapist", "parent"})
+async def reports_pdf(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin", "therapist", "parent"})
     if response:
         return response
 
-    report_data = _report_payload(db, request.query_params)
+    report_data = await _report_payload(db, request.query_params)
     selected_child = report_data.get("selected_child")
     if not selected_child:
         _set_flash(request, "Выберите ребенка, чтобы сформировать PDF-отчет.")
         return RedirectResponse(url="/reports", status_code=303)
 
-    pdf_bytes = _build_report_pdf(report_data)
+    # All queries are done; free the pooled connection before the
+    # CPU-bound PDF build instead of holding it for another 100ms+.
+    await db.close()
+
+    # ReportLab is pure CPU: run it on the threadpool so the event loop
+    # keeps serving pages, and cap concurrent builds so a burst of report
+    # downloads cannot monopolize every worker thread.
+    pdf_spool = await anyio.to_thread.run_sync(
+        _build_report_pdf, report_data, limiter=_PDF_BUILD_LIMITER
+    )
     safe_date = date.today().isoformat()
-    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", selected_child.full_name or "child").strip("_")
+    safe_name = _SAFE_NAME_RE.sub("_", selected_child.full_name or "child").strip("_")
     if not safe_name:
         safe_name = "child"
     filename = f"ablls_report_{safe_name}_{safe_date}.pdf"
     headers = {
         "Content-Disposition": f'attachment; filename="{filename}"',
     }
-    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+    # Hand the spool to the ASGI server in chunks instead of copying it
+    # into an intermediate bytes object; the generator closes the spool
+    # (and deletes any on-disk overflow) once the response is sent.
+    def pdf_chunks(spool=pdf_spool, chunk_size=64 * 1024):
+        try:
+            while chunk := spool.read(chunk_size):
+                yield chunk
+        finally:
+            spool.close()
+
+    return StreamingResponse(pdf_chunks(), media_type="application/pdf", headers=headers)
 
 
 @router.get("/history")
-def history(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin"})
+async def history(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    logs = db.execute(
-        select(AuditLog).order_by(AuditLog.created_at.desc()).limit(200)
-    ).scalars().all()
-    users = db.execute(select(User)).scalars().all()
-    user_map = {user.id: user for user in users}
-    context = _base_context(request, db)
-    context.update({"logs": logs, "log_user_map": user_map})
-    return templates.TemplateResponse("history.html", context)
+    before = _parse_created_cursor(request.query_params.get("before"))
+    log_query = select(AuditLog)
+    if before:
+        log_query = log_query.where(AuditLog.created_at < before)
+    logs = (await db.execute(
+        log_query.order_by(AuditLog.created_at.desc()).limit(200)
+    )).scalars().all()
+    older_logs_url = None
+    if len(logs) == 200:
+        older_logs_url = f"/history?before={logs[-1].created_at.isoformat()}"
+    log_user_ids = {log.user_id for log in logs if log.user_id}
+    user_map = {}
+    if log_user_ids:
+        # The template only shows names; no reason to haul password hashes
+        # and the rest of the row along.
+        user_map = {
+            user.id: user
+            for user in (await db.execute(
+                select(User)
+                .options(load_only(User.id, User.full_name))
+                .where(User.id.in_(log_user_ids))
+            )).scalars()
+        }
+    context = await _base_context(request, db)
+    context.update({"logs": logs, "log_user_map": user_map, "older_logs_url": older_logs_url})
+    return render_template("history.html", context)
 
 
 @router.get("/admin/users")
-def admin_users(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin"})
+async def admin_users(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    users = db.execute(select(User).order_by(User.created_at.desc())).scalars().all()
-    context = _base_context(request, db)
+    # Everything the listing shows, and nothing else — in particular the
+    # password hashes stay in the database.
+    users = (await db.execute(
+        select(User)
+        .options(
+            load_only(User.id, User.email, User.full_name, User.role, User.created_at)
+        )
+        .order_by(User.created_at.desc())
+    )).scalars().all()
+    context = await _base_context(request, db)
     context.update({"users": users})
-    return templates.TemplateResponse("admin/users.html", context)
+    return render_template("admin/users.html", context)
 
 
 @router.get("/admin/edit-requests")
-def admin_edit_requests(request: Request, db: Session = Depends(get_db)):
-    _, response = _require_roles(request, db, {"admin"})
+async def admin_edit_requests(request: Request, db: AsyncSession = Depends(get_async_db)):
+    _, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    reqs = db.execute(
-        select(EditRequest).order_by(EditRequest.created_at.desc())
-    ).scalars().all()
-    children = db.execute(select(Child)).scalars().all()
-    users = db.execute(select(User)).scalars().all()
-    child_map = {child.id: child for child in children}
-    user_map = {user.id: user for user in users}
-
-    req_skill_codes = sorted({(req.area or "").strip().upper() for req in reqs if req.area})
-    req_tasks = []
-    if req_skill_codes:
-        req_tasks = db.execute(select(ABLLSTask).where(ABLLSTask.code.in_(req_skill_codes))).scalars().all()
-    req_task_map = {task.code: task for task in req_tasks}
-
-    context = _base_context(request, db)
-    context.update(
-        {
-            "edit_requests": reqs,
-            "edit_request_child_map": child_map,
-            "edit_request_user_map": user_map,
-            "edit_request_task_map": req_task_map,
-        }
-    )
-    return templates.TemplateResponse("admin/edit_requests.html", context)
+    # Joined loads pull only the children/users/tasks actually referenced,
+    # instead of hydrating id maps over whole tables.
+    reqs = (await db.execute(
+        select(EditRequest)
+        .options(
+            joinedload(EditRequest.child).load_only(Child.full_name),
+            joinedload(EditRequest.therapist).load_only(User.full_name),
+            joinedload(EditRequest.task).load_only(
+                ABLLSTask.objective, ABLLSTask.max_score
+            ),
+            # Anything the template touches beyond the joined loads (e.g. the
+            # reviewer) should fail loudly, not lazy-load per row.
+            raiseload("*"),
+        )
+        .order_by(EditRequest.created_at.desc())
+    )).scalars().all()
+
+    context = await _base_context(request, db)
+    context.update({"edit_requests": reqs})
+    return render_template("admin/edit_requests.html", context)
 
 
 @router.post("/admin/edit-requests/{request_id}/decision")
-def set_edit_request_decision(
+async def set_edit_request_decision(
     request_id: str,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     decision: str = Form(...),
     admin_comment: str = Form(""),
 ):
-    user, response = _require_roles(request, db, {"admin"})
+    user, response = await _require_roles(request, db, {"admin"})
     if response:
         return response
 
-    req = db.get(EditRequest, request_id)
+    req = await db.get(EditRequest, request_id)
     if not req:
         _set_flash(request, "Запрос не найден.")
         return RedirectResponse(url="/admin/edit-requests", status_code=303)
@@ -1223,7 +1680,7 @@ def set_edit_request_decision(
         return RedirectResponse(url="/admin/edit-requests", status_code=303)
 
     if decision == "approved":
-        task = db.get(ABLLSTask, (req.area or "").strip().upper())
+        task = await db.get(ABLLSTask, (req.area or "").strip().upper())
         if not task:
             _set_flash(request, "Нельзя применить запрос: навык ABLLS-R не найден.")
             return RedirectResponse(url="/admin/edit-requests", status_code=303)
@@ -1252,14 +1709,14 @@ def set_edit_request_decision(
             comment=req.requested_comment,
         )
         db.add(applied_assessment)
-        db.flush()
+        await db.flush()
         req.applied_assessment_id = applied_assessment.id
 
     req.status = decision
     req.admin_comment = admin_comment.strip() or None
     req.reviewed_by = user.id
     req.reviewed_at = datetime.now(timezone.utc)
-    _log_action(
+    await _log_action(
         db,
         user.id,
         "review_edit_request",
@@ -1268,23 +1725,21 @@ def set_edit_request_decision(
             f"(child={req.child_id}, skill={req.area}, applied={req.applied_assessment_id or '-'})"
         ),
     )
-    db.commit()
+    await db.commit()
     _set_flash(request, "Решение по запросу сохранено.")
     return RedirectResponse(url="/admin/edit-requests", status_code=303)
 
 
 @router.get("/requests")
-def edit_requests(request: Request, db: Session = Depends(get_db)):
-    user, response = _require_roles(request, db, {"therapist"})
+async def edit_requests(request: Request, db: AsyncSession = Depends(get_async_db)):
+    user, response = await _require_roles(request, db, {"therapist"})
     if response:
         return response
 
-    assigned_children = _children_for_therapist(db, user.id)
+    assigned_children = await _children_for_therapist(db, user.id)
     child_map = {child.id: child for child in assigned_children}
 
-    tasks = _all_ablls_tasks(db)
-    task_by_code = {task.code: task for task in tasks}
-    sections = _section_options(tasks)
+    tasks, sections, task_by_code, tasks_by_section, codes_by_section = await _get_catalog(db)
 
     selected_section = request.query_params.get("section")
     valid_sections = {section["code"] for section in sections}
@@ -1298,20 +1753,20 @@ def edit_requests(request: Request, db: Session = Depends(get_db)):
 
     selected_request_skill_code = (request.query_params.get("skill_code") or "").strip().upper()
 
-    section_tasks = [
-        task for task in tasks if selected_section and task.section_code == selected_section
-    ]
-    section_task_codes = {task.code for task in section_tasks}
+    section_tasks = tasks_by_section.get(selected_section, []) if selected_section else []
+    section_task_codes = (
+        codes_by_section.get(selected_section, frozenset()) if selected_section else frozenset()
+    )
     if selected_request_skill_code not in section_task_codes:
         selected_request_skill_code = ""
 
-    reqs = db.execute(
+    reqs = (await db.execute(
         select(EditRequest)
         .where(EditRequest.therapist_id == user.id)
         .order_by(EditRequest.created_at.desc())
-    ).scalars().all()
+    )).scalars().all()
 
-    context = _base_context(request, db)
+    context = await _base_context(request, db)
     context.update(
         {
             "assigned_children": assigned_children,
@@ -1325,13 +1780,13 @@ def edit_requests(request: Request, db: Session = Depends(get_db)):
             "selected_request_skill_code": selected_request_skill_code,
         }
     )
-    return templates.TemplateResponse("requests.html", context)
+    return render_template("requests.html", context)
 
 
 @router.post("/requests")
-def create_edit_request(
+async def create_edit_request(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     child_id: str = Form(...),
     skill_code: str = Form(...),
     requested_score: int = Form(...),
@@ -1340,27 +1795,26 @@ def create_edit_request(
     requested_comment: str = Form(""),
     reason: str = Form(...),
 ):
-    user, response = _require_roles(request, db, {"therapist"})
+    user, response = await _require_roles(request, db, {"therapist"})
     if response:
         return response
 
-    allowed_child_ids = {child.id for child in _children_for_therapist(db, user.id)}
-    if child_id not in allowed_child_ids:
+    if not await _authorized_child(db, user.id, child_id):
         _set_flash(request, "Нельзя отправить запрос для неназначенного ребенка.")
         return RedirectResponse(url="/requests", status_code=303)
 
     reason_clean = reason.strip()
-    task = db.get(ABLLSTask, skill_code.strip().upper())
+    task = await db.get(ABLLSTask, skill_code.strip().upper())
     if not task:
         _set_flash(request, "Навык ABLLS-R не найден.")
         return RedirectResponse(url="/requests", status_code=303)
 
-    existing_assessment = db.execute(
+    existing_assessment = (await db.execute(
         select(Assessment.id).where(
             Assessment.child_id == child_id,
             Assessment.area == task.code,
         )
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
     if not existing_assessment:
         _set_flash(
             request,
@@ -1393,14 +1847,14 @@ def create_edit_request(
             status_code=303,
         )
 
-    existing_pending = db.execute(
+    existing_pending = (await db.execute(
         select(EditRequest.id).where(
             EditRequest.therapist_id == user.id,
             EditRequest.child_id == child_id,
             EditRequest.area == task.code,
             EditRequest.status == "pending",
         )
-    ).scalar_one_or_none()
+    )).scalar_one_or_none()
     if existing_pending:
         _set_flash(request, "По этому навыку уже есть незавершенный запрос.")
         return RedirectResponse(
@@ -1422,7 +1876,7 @@ def create_edit_request(
         )
     )
     mode_label = "с подсказкой" if requested_is_prompted else "самостоятельно"
-    _log_action(
+    await _log_action(
         db,
         user.id,
         "create_edit_request",
@@ -1431,7 +1885,7 @@ def create_edit_request(
             f"{mode_label}, дата {parsed_date.isoformat()}"
         ),
     )
-    db.commit()
+    await db.commit()
     _set_flash(request, "Запрос отправлен.")
     return RedirectResponse(
         url=f"/requests?section={task.section_code}&child_id={child_id}&skill_code={task.code}",
@@ -1440,34 +1894,43 @@ def create_edit_request(
 
 
 @router.get("/progress")
-def progress(request: Request, db: Session = Depends(get_db)):
-    user, response = _require_roles(request, db, {"parent"})
+async def progress(request: Request, db: AsyncSession = Depends(get_async_db)):
+    user, response = await _require_roles(request, db, {"parent"})
     if response:
         return response
 
-    children = _children_for_parent(db, user.id)
+    children = await _children_for_parent(db, user.id)
     child_ids = {child.id for child in children}
     selected_child_id = request.query_params.get("child_id")
     if selected_child_id not in child_ids:
         selected_child_id = children[0].id if children else None
 
     selected_child = next((child for child in children if child.id == selected_child_id), None)
-    tasks = _all_ablls_tasks(db)
-    task_by_code = {task.code: task for task in tasks}
+    tasks, _, task_by_code, tasks_by_section, _ = await _get_catalog(db)
 
-    latest_by_skill = _latest_assessment_by_skill(db, selected_child_id) if selected_child_id else {}
-    section_rows = _section_progress_rows(tasks, latest_by_skill) if selected_child else []
+    section_rows = await _section_progress_rows_sql(db, selected_child.id) if selected_child else []
 
+    before = _parse_assessment_cursor(request.query_params.get("before"))
     recent_rows: list[Assessment] = []
+    older_assessments_url = None
     if selected_child:
-        recent_rows = db.execute(
-            select(Assessment)
-            .where(Assessment.child_id == selected_child.id)
+        recent_query = select(Assessment).where(Assessment.child_id == selected_child.id)
+        if before:
+            recent_query = recent_query.where(
+                tuple_(Assessment.assessment_date, Assessment.created_at) < before
+            )
+        recent_rows = (await db.execute(
+            recent_query
             .order_by(Assessment.assessment_date.desc(), Assessment.created_at.desc())
             .limit(80)
-        ).scalars().all()
+        )).scalars().all()
+        if len(recent_rows) == 80:
+            older_assessments_url = (
+                f"/progress?child_id={selected_child.id}"
+                f"&before={_assessment_cursor(recent_rows[-1])}"
+            )
 
-    context = _base_context(request, db)
+    context = await _base_context(request, db)
     context.update(
         {
             "children": children,
@@ -1475,7 +1938,8 @@ def progress(request: Request, db: Session = Depends(get_db)):
             "selected_child_id": selected_child_id,
             "section_rows": section_rows,
             "recent_assessments": recent_rows,
+            "older_assessments_url": older_assessments_url,
             "task_by_code": task_by_code,
         }
     )
-    return templates.TemplateResponse("progress.html", context)
+    return render_template("progress.html", context)
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
+import threading
 from typing import Dict, Optional
 import uuid
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemoryUser:
     id: str
     email: str
@@ -16,26 +17,32 @@ class MemoryStore:
     def __init__(self) -> None:
         self._users: Dict[str, MemoryUser] = {}
         self._users_by_email: Dict[str, MemoryUser] = {}
+        # Guards the existence check plus the double insert so concurrent
+        # create_user calls from threadpool workers cannot race past the
+        # duplicate-email check or leave the two indexes out of sync.
+        self._lock = threading.Lock()
 
     def create_user(self, email: str, full_name: str, role: str, password_hash: str) -> MemoryUser:
-        if email in self._users_by_email:
-            raise ValueError("email_exists")
-        user = MemoryUser(
-            id=str(uuid.uuid4()),
-            email=email,
-            full_name=full_name,
-            role=role,
-            password_hash=password_hash,
-        )
-        self._users[user.id] = user
-        self._users_by_email[email] = user
-        return user
+        email = email.strip().lower()
+        with self._lock:
+            if email in self._users_by_email:
+                raise ValueError("email_exists")
+            user = MemoryUser(
+                id=str(uuid.uuid4()),
+                email=email,
+                full_name=full_name,
+                role=role,
+                password_hash=password_hash,
+            )
+            self._users[user.id] = user
+            self._users_by_email[email] = user
+            return user
 
     def get_user(self, user_id: str) -> Optional[MemoryUser]:
         return self._users.get(user_id)
 
     def get_user_by_email(self, email: str) -> Optional[MemoryUser]:
-        return self._users_by_email.get(email)
+        return self._users_by_email.get(email.strip().lower())
 
 
 memory_store = MemoryStore()